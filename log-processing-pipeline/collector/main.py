@@ -16,7 +16,9 @@ def main() -> None:
     tracker = OffsetTracker(cfg.state_file)
     line_filter = RawLineFilter(list(cfg.filters)) if cfg.filters else None
     collector = Collector(cfg.source_file, cfg.output_dir, cfg.batch_size, tracker, line_filter)
-    metrics = Metrics("/data/collected/.collector_metrics.json")
+    metrics = Metrics("/data/collected/.collector_metrics.json", names=[
+        "polls_performed", "lines_collected", "batches_written", "empty_polls",
+    ])
 
     running = True
 
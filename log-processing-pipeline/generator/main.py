@@ -37,7 +37,7 @@ def main() -> None:
     cfg = GeneratorConfig.from_dict(load_yaml()["generator"])
     writer = LogFileWriter(cfg.log_file)
     gen_line = _get_line_generator(cfg.format)
-    metrics = Metrics("/logs/.generator_metrics.json")
+    metrics = Metrics("/logs/.generator_metrics.json", names=["logs_generated"])
 
     running = True
 
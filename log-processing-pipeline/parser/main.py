@@ -16,7 +16,9 @@ def main() -> None:
     tracker = StateTracker(cfg.state_file)
     entry_filter = EntryFilter(list(cfg.filters)) if cfg.filters else None
     parser = Parser(cfg.input_dir, cfg.output_dir, tracker, entry_filter)
-    metrics = Metrics("/data/parsed/.parser_metrics.json")
+    metrics = Metrics("/data/parsed/.parser_metrics.json", names=[
+        "entries_parsed", "files_parsed",
+    ])
 
     running = True
 
@@ -1,16 +1,36 @@
 """Search NDJSON storage by pattern or by index lookup."""
 
 import gzip
+import io
 import json
+import mmap
 import os
 import re
+from array import array
 from typing import Iterator
 
+try:
+    import hyperscan
+except ImportError:  # optional accelerator; fall back to the re module
+    hyperscan = None
+
+try:
+    import zstandard
+except ImportError:  # only needed to read .zst archives
+    zstandard = None
+
+_COMPRESSED_SUFFIXES = (".gz", ".zst")
+
 
 def _open_ndjson(path: str):
-    """Open an NDJSON file, handling .gz transparently."""
+    """Open an NDJSON file, handling .gz and .zst transparently."""
     if path.endswith(".gz"):
         return gzip.open(path, "rt", encoding="utf-8")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+        return io.TextIOWrapper(reader, encoding="utf-8")
     return open(path, "r")
 
 
@@ -23,29 +43,141 @@ def _ndjson_files(storage_dir: str) -> list[str]:
     archive_dir = os.path.join(storage_dir, "archive")
     if os.path.isdir(archive_dir):
         for f in sorted(os.listdir(archive_dir)):
-            if f.endswith(".ndjson") or f.endswith(".ndjson.gz"):
+            if f.endswith((".ndjson", ".ndjson.gz", ".ndjson.zst")):
                 files.append(os.path.join(archive_dir, f))
     return files
 
 
+def _offsets_path(path: str) -> str:
+    """Return the offsets sidecar path the storage engine keeps for *path*."""
+    dirname, basename = os.path.split(path)
+    stem = basename[:-len(".ndjson")] if basename.endswith(".ndjson") else basename
+    return os.path.join(dirname, f".{stem}.offsets")
+
+
+def _load_offsets(path: str) -> array | None:
+    """Load the line offset table for *path*, or None if it is unavailable."""
+    offsets_path = _offsets_path(path)
+    if not os.path.exists(offsets_path):
+        return None
+    offsets = array("Q")
+    with open(offsets_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or size % offsets.itemsize:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offsets.frombytes(mm)
+    return offsets
+
+
+def _read_lines_at(path: str, offsets: array, line_numbers: list[int]) -> Iterator[str]:
+    """Yield the requested lines of *path* by seeking to their byte offsets."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        last = len(offsets) - 1
+        for n in line_numbers:
+            if n > last:
+                break
+            start = offsets[n]
+            end = offsets[n + 1] if n < last else size
+            raw = os.pread(fd, end - start, start)
+            yield raw.split(b"\n", 1)[0].decode("utf-8")
+    finally:
+        os.close(fd)
+
+
+def _compile_hyperscan(pattern: str):
+    """Compile *pattern* into a hyperscan database, or None if unsupported."""
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    try:
+        db.compile(
+            expressions=[pattern.encode("utf-8")],
+            ids=[0],
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE],
+        )
+    except hyperscan.error:
+        # Pattern uses syntax hyperscan does not support (e.g. backrefs)
+        return None
+    return db
+
+
+def _scan_hyperscan(db, regex: re.Pattern, path: str, limit: int) -> list[dict]:
+    """Return up to *limit* entries of *path* matching *regex*, in one hyperscan pass.
+
+    Hyperscan runs over the whole file, so a match may span a newline
+    where the per-line ``re`` search never could; each hit's line is
+    therefore confirmed with *regex*. Only lines that also decode as JSON
+    count toward *limit*.
+    """
+    entries: list[dict] = []
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return entries
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            line_end = -1
+
+            def on_match(_id, _start, to, _flags, _ctx):
+                nonlocal line_end
+                if to <= line_end:
+                    return False  # another match on a line already checked
+                start = mm.rfind(b"\n", 0, to) + 1
+                end = mm.find(b"\n", to)
+                if end < 0:
+                    end = len(mm)
+                line_end = end
+                try:
+                    line = mm[start:end].decode("utf-8")
+                    if line and regex.search(line):
+                        entries.append(json.loads(line))
+                except ValueError:  # undecodable bytes or invalid JSON
+                    return False
+                return len(entries) >= limit
+
+            try:
+                db.scan(mm, match_event_handler=on_match)
+            except hyperscan.ScanTerminated:
+                pass  # on_match stopped the scan once the limit was reached
+    return entries
+
+
 def search_by_pattern(storage_dir: str, pattern: str, limit: int = 50) -> Iterator[dict]:
-    """Iterate NDJSON files and yield entries matching the regex pattern."""
+    """Iterate NDJSON files and yield entries matching the regex pattern.
+
+    Plain NDJSON files are scanned with hyperscan when it is installed and
+    understands the pattern; otherwise each line is matched with ``re``.
+    Both find the same entries.
+    """
     regex = re.compile(pattern, re.IGNORECASE)
+    db = _compile_hyperscan(pattern)
     count = 0
     for path in _ndjson_files(storage_dir):
-        with _open_ndjson(path) as f:
-            for line in f:
-                line = line.rstrip("\n")
-                if not line:
-                    continue
-                if regex.search(line):
-                    try:
-                        yield json.loads(line)
-                        count += 1
-                        if count >= limit:
-                            return
-                    except json.JSONDecodeError:
-                        continue
+        if db is not None and not path.endswith(_COMPRESSED_SUFFIXES):
+            for entry in _scan_hyperscan(db, regex, path, limit - count):
+                yield entry
+                count += 1
+            if count >= limit:
+                return
+            continue
+        for line in _search_lines(path, regex):
+            try:
+                yield json.loads(line)
+                count += 1
+                if count >= limit:
+                    return
+            except json.JSONDecodeError:
+                continue
+
+
+def _search_lines(path: str, regex: re.Pattern) -> Iterator[str]:
+    """Yield the non-empty lines of *path* that match *regex*."""
+    with _open_ndjson(path) as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line and regex.search(line):
+                yield line
 
 
 def search_by_index(storage_dir: str, index_type: str, index_value: str,
@@ -65,25 +197,38 @@ def search_by_index(storage_dir: str, index_type: str, index_value: str,
         filename = item["file"]
         line_numbers = set(item["line_numbers"])
 
-        # Resolve file path (try plain, then .gz)
+        # Resolve file path (try plain, then .zst, then .gz)
         path = os.path.join(storage_dir, "active", filename)
         if not os.path.exists(path):
             path = os.path.join(storage_dir, "archive", filename)
+        if not os.path.exists(path):
+            path = os.path.join(storage_dir, "archive", filename + ".zst")
         if not os.path.exists(path):
             path = os.path.join(storage_dir, "archive", filename + ".gz")
         if not os.path.exists(path):
             continue
 
-        with _open_ndjson(path) as f:
-            for i, line in enumerate(f):
-                if i in line_numbers:
-                    line = line.rstrip("\n")
-                    if not line:
-                        continue
-                    try:
-                        yield json.loads(line)
-                        count += 1
-                        if count >= limit:
-                            return
-                    except json.JSONDecodeError:
-                        continue
+        offsets = None if path.endswith(_COMPRESSED_SUFFIXES) else _load_offsets(path)
+        if offsets is not None:
+            lines = _read_lines_at(path, offsets, sorted(line_numbers))
+        else:
+            lines = _scan_lines(path, line_numbers)
+
+        for line in lines:
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+                count += 1
+                if count >= limit:
+                    return
+            except json.JSONDecodeError:
+                continue
+
+
+def _scan_lines(path: str, line_numbers: set[int]) -> Iterator[str]:
+    """Walk *path* sequentially and yield the lines whose index is requested."""
+    with _open_ndjson(path) as f:
+        for i, line in enumerate(f):
+            if i in line_numbers:
+                yield line.rstrip("\n")
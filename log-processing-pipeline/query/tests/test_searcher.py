@@ -4,7 +4,10 @@ import json
 import os
 import tempfile
 import unittest
+from array import array
+from unittest import mock
 
+from query.src import searcher
 from query.src.searcher import search_by_pattern, search_by_index
 
 
@@ -54,10 +57,76 @@ class TestSearcher(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]["level"], "ERROR")
 
+    def test_index_search_with_offsets(self):
+        path = os.path.join(self._active, "store_current.ndjson")
+        offsets = array("Q")
+        pos = 0
+        with open(path, "rb") as f:
+            for line in f:
+                offsets.append(pos)
+                pos += len(line)
+        with open(os.path.join(self._active, ".store_current.offsets"), "wb") as f:
+            f.write(offsets.tobytes())
+
+        results = list(search_by_index(self._storage, "level", "ERROR", 10))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["path"], "/error")
+
+    @unittest.skipUnless(searcher.zstandard is not None, "zstandard not installed")
+    def test_pattern_search_reads_zst_archive(self):
+        lines = [
+            json.dumps({"method": "DELETE", "path": "/old", "level": "INFO"}),
+            json.dumps({"method": "GET", "path": "/old", "level": "INFO"}),
+        ]
+        cctx = searcher.zstandard.ZstdCompressor(level=3)
+        with open(os.path.join(self._archive, "store_20260101T000000.ndjson.zst"), "wb") as f:
+            f.write(cctx.compress(("\n".join(lines) + "\n").encode()))
+
+        results = list(search_by_pattern(self._storage, "DELETE", 10))
+        self.assertEqual([r["path"] for r in results], ["/old"])
+        self.assertEqual(len(list(search_by_pattern(self._storage, "GET", 10))), 3)
+
     def test_index_search_missing(self):
         results = list(search_by_index(self._storage, "level", "DEBUG", 10))
         self.assertEqual(len(results), 0)
 
 
+@unittest.skipUnless(searcher.hyperscan is not None, "hyperscan not installed")
+class TestHyperscanSearch(unittest.TestCase):
+    def setUp(self):
+        self._storage = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self._storage, "active"))
+        lines = [
+            json.dumps({"method": "GET", "status_code": 200}),
+            '{"method": "GET", broken',
+            json.dumps({"method": "GET", "status_code": 500}),
+            json.dumps({"method": "POST", "status_code": 201}),
+        ]
+        path = os.path.join(self._storage, "active", "store_current.ndjson")
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def _search_re(self, pattern, limit):
+        with mock.patch.object(searcher, "_compile_hyperscan", return_value=None):
+            return list(search_by_pattern(self._storage, pattern, limit))
+
+    def test_matches_re_path(self):
+        for pattern in ("GET", "status_code\": 5", "post"):
+            self.assertEqual(
+                list(search_by_pattern(self._storage, pattern, 10)),
+                self._search_re(pattern, 10),
+            )
+
+    def test_invalid_json_does_not_use_up_limit(self):
+        results = list(search_by_pattern(self._storage, "GET", 2))
+        self.assertEqual([r["status_code"] for r in results], [200, 500])
+        self.assertEqual(results, self._search_re("GET", 2))
+
+    def test_match_cannot_span_lines(self):
+        # \s and negated classes would cross the newline in a whole-file scan
+        for pattern in ("500}\\s+\\{", "broken[^x]+500"):
+            self.assertEqual(list(search_by_pattern(self._storage, pattern, 10)), [])
+
+
 if __name__ == "__main__":
     unittest.main()
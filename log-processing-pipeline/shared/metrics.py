@@ -4,21 +4,32 @@ import json
 import os
 import tempfile
 import time
+from array import array
 from datetime import datetime, timezone
 
 
 class Metrics:
-    def __init__(self, path: str):
-        self._counters: dict[str, int] = {}
+    def __init__(self, path: str, names: list[str] | None = None):
+        # Counters declared up front live in a preallocated array indexed by
+        # name; anything else falls back to a plain dict.
+        self._idx: dict[str, int] = {n: i for i, n in enumerate(names or [])}
+        self._counters = array("q", [0] * len(self._idx))
+        self._extra: dict[str, int] = {}
         self._path = path
         self._start_time = time.time()
 
     def increment(self, name: str, amount: int = 1) -> None:
-        self._counters[name] = self._counters.get(name, 0) + amount
+        i = self._idx.get(name)
+        if i is not None:
+            self._counters[i] += amount
+        else:
+            self._extra[name] = self._extra.get(name, 0) + amount
 
     def get_all(self) -> dict:
+        counters = {n: self._counters[i] for n, i in self._idx.items()}
+        counters.update(self._extra)
         return {
-            "counters": dict(self._counters),
+            "counters": counters,
             "uptime_seconds": round(time.time() - self._start_time, 1),
             "last_updated": datetime.now(timezone.utc).isoformat(),
         }
@@ -29,7 +40,7 @@ class Metrics:
         fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self._path))
         try:
             with os.fdopen(fd, "w") as f:
-                json.dump(data, f, indent=2)
+                json.dump(data, f, separators=(",", ":"))
             os.replace(tmp, self._path)
         except Exception:
             if os.path.exists(tmp):
@@ -25,7 +25,9 @@ def main() -> None:
     )
     engine = StorageEngine(cfg.input_dir, cfg.storage_dir, tracker, indexer, rotator,
                            cfg.compression_enabled)
-    metrics = Metrics("/data/storage/.storage_metrics.json")
+    metrics = Metrics("/data/storage/.storage_metrics.json", names=[
+        "entries_stored", "files_ingested", "index_updates",
+    ])
 
     running = True
 
@@ -56,6 +58,7 @@ def main() -> None:
 
         time.sleep(cfg.poll_interval)
 
+    engine.close()
     metrics.save()
     print("Storage: shutdown complete", flush=True)
 
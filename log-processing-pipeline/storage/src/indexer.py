@@ -9,13 +9,28 @@ Each manifest is a list of {"file": "store_current.ndjson", "line_numbers": [0,
 import json
 import os
 import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Flushes touching more manifests than this are written on a thread pool.
+_PARALLEL_THRESHOLD = 4
+_MAX_WORKERS = 8
+# Manifest directories remembered as already written, least recently used first out.
+_KNOWN_DIRS_MAX = 1024
 
 
 class Indexer:
     def __init__(self, index_dir: str):
         self._index_dir = index_dir
-        # In-memory cache: {index_type: {index_value: {file: set(line_numbers)}}}
-        self._data: dict[str, dict[str, dict[str, set[int]]]] = {}
+        # In-memory cache: {index_type: {index_value: {file: [line_numbers]}}}
+        # Line numbers arrive in increasing order per file, so lists stay sorted.
+        self._data: dict[str, dict[str, dict[str, list[int]]]] = {}
+        # Manifest directories we have already written a manifest into, so
+        # repeat flushes skip the makedirs/exists stat calls. Bounded LRU,
+        # shared by the flush threads.
+        self._known_dirs: OrderedDict[str, None] = OrderedDict()
+        self._known_lock = threading.Lock()
 
     def add_entry(self, data_file: str, line_number: int, entry: dict) -> None:
         """Index an entry by level and date."""
@@ -29,43 +44,78 @@ class Indexer:
 
     def _add(self, index_type: str, value: str, data_file: str, line_no: int) -> None:
         bucket = self._data.setdefault(index_type, {}).setdefault(value, {})
-        bucket.setdefault(data_file, set()).add(line_no)
+        bucket.setdefault(data_file, []).append(line_no)
 
     def save(self) -> None:
-        """Persist all in-memory indexes to disk as manifest files."""
-        for index_type, values in self._data.items():
-            for value, file_map in values.items():
-                manifest_dir = os.path.join(self._index_dir, index_type, value)
-                os.makedirs(manifest_dir, exist_ok=True)
-                manifest_path = os.path.join(manifest_dir, "manifest.json")
-
-                # Load existing manifest
-                existing: list[dict] = []
-                if os.path.exists(manifest_path):
-                    with open(manifest_path, "r") as f:
-                        existing = json.load(f)
-
-                # Merge
-                existing_map: dict[str, set[int]] = {}
-                for item in existing:
-                    existing_map[item["file"]] = set(item["line_numbers"])
-
-                for fname, lines in file_map.items():
-                    existing_map.setdefault(fname, set()).update(lines)
-
-                manifest = [
-                    {"file": fname, "line_numbers": sorted(lns)}
-                    for fname, lns in sorted(existing_map.items())
-                ]
-
-                fd, tmp = tempfile.mkstemp(dir=manifest_dir)
-                try:
-                    with os.fdopen(fd, "w") as f:
-                        json.dump(manifest, f, indent=2)
-                    os.replace(tmp, manifest_path)
-                except Exception:
-                    os.unlink(tmp)
-                    raise
+        """Persist all in-memory indexes to disk as manifest files.
+
+        Each (index_type, value) manifest lives in its own directory, so
+        larger flushes write them concurrently on a small thread pool.
+        """
+        work = [
+            (os.path.join(self._index_dir, index_type, value), file_map)
+            for index_type, values in self._data.items()
+            for value, file_map in values.items()
+        ]
+        if len(work) > _PARALLEL_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as ex:
+                list(ex.map(lambda w: self._flush_one(*w), work))
+        else:
+            for manifest_dir, file_map in work:
+                self._flush_one(manifest_dir, file_map)
 
         # Clear in-memory cache after flush
         self._data.clear()
+
+    def _flush_one(self, manifest_dir: str, file_map: dict[str, list[int]]) -> None:
+        """Merge *file_map* into the manifest in *manifest_dir* and write it."""
+        with self._known_lock:
+            known = manifest_dir in self._known_dirs
+        if not known:
+            os.makedirs(manifest_dir, exist_ok=True)
+        manifest_path = os.path.join(manifest_dir, "manifest.json")
+
+        # Load existing manifest
+        existing: list[dict] = []
+        if known or os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, "r") as f:
+                    existing = json.load(f)
+            except FileNotFoundError:
+                pass  # removed since we last wrote it
+
+        # Merge — only pay for a set union when the file already
+        # has line numbers on disk (e.g. after a restart).
+        existing_map: dict[str, list[int]] = {}
+        for item in existing:
+            existing_map[item["file"]] = item["line_numbers"]
+
+        for fname, lines in file_map.items():
+            prior = existing_map.get(fname)
+            if prior:
+                existing_map[fname] = sorted(set(prior) | set(lines))
+            else:
+                existing_map[fname] = lines
+
+        manifest = [
+            {"file": fname, "line_numbers": lns}
+            for fname, lns in sorted(existing_map.items())
+        ]
+
+        fd, tmp = tempfile.mkstemp(dir=manifest_dir)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(manifest, f, separators=(",", ":"))
+            os.replace(tmp, manifest_path)
+            self._remember_dir(manifest_dir)
+        except Exception:
+            os.unlink(tmp)
+            raise
+
+    def _remember_dir(self, manifest_dir: str) -> None:
+        """Mark *manifest_dir* as holding a manifest, evicting the oldest entry."""
+        with self._known_lock:
+            self._known_dirs[manifest_dir] = None
+            self._known_dirs.move_to_end(manifest_dir)
+            if len(self._known_dirs) > _KNOWN_DIRS_MAX:
+                self._known_dirs.popitem(last=False)
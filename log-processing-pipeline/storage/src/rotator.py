@@ -6,6 +6,11 @@ import shutil
 import time
 from datetime import datetime, timezone
 
+try:
+    import zstandard
+except ImportError:  # fall back to gzip archives
+    zstandard = None
+
 
 class Rotator:
     def __init__(self, active_dir: str, archive_dir: str,
@@ -37,7 +42,21 @@ class Rotator:
         return archive_path
 
     def compress(self, archive_path: str) -> str:
-        """Gzip an archived NDJSON file. Returns path to .gz file."""
+        """Compress an archived NDJSON file with zstd (level 3).
+
+        Returns the path to the .zst file, or to a .gz file when the
+        zstandard package is not installed.
+        """
+        if zstandard is None:
+            return self._compress_gzip(archive_path)
+        zst_path = archive_path + ".zst"
+        cctx = zstandard.ZstdCompressor(level=3, threads=-1)
+        with open(archive_path, "rb") as f_in, open(zst_path, "wb") as f_out:
+            cctx.copy_stream(f_in, f_out, read_size=1 << 20)
+        os.remove(archive_path)
+        return zst_path
+
+    def _compress_gzip(self, archive_path: str) -> str:
         gz_path = archive_path + ".gz"
         with open(archive_path, "rb") as f_in:
             with gzip.open(gz_path, "wb") as f_out:
@@ -2,6 +2,7 @@
 
 import json
 import os
+from array import array
 
 from storage.src.state_tracker import StateTracker
 from storage.src.indexer import Indexer
@@ -20,21 +21,30 @@ class StorageEngine:
         self._compression_enabled = compression_enabled
         self._active_dir = os.path.join(storage_dir, "active")
         os.makedirs(self._active_dir, exist_ok=True)
+        self._open_active()
 
     @property
     def _active_path(self) -> str:
         return os.path.join(self._active_dir, "store_current.ndjson")
 
+    @property
+    def _offsets_path(self) -> str:
+        """Byte offset of each active line, packed as unsigned 64-bit ints."""
+        return os.path.join(self._active_dir, ".store_current.offsets")
+
     def poll_once(self) -> int:
         """Ingest unprocessed parsed JSON files. Return entries stored."""
         if not os.path.isdir(self._input_dir):
             return 0
 
-        files = sorted(
-            f for f in os.listdir(self._input_dir)
-            if f.endswith(".json") and not f.startswith(".")
-            and not self._tracker.is_processed(f)
-        )
+        processed = self._tracker.processed
+        with os.scandir(self._input_dir) as it:
+            files = sorted(
+                e.name for e in it
+                if e.name.endswith(".json") and e.name[0] != "."
+                and e.name not in processed
+                and e.is_file(follow_symlinks=False)
+            )
 
         total = 0
         for filename in files:
@@ -48,29 +58,74 @@ class StorageEngine:
             self._indexer.save()
 
         # Check rotation
-        if self._rotator.needs_rotation(self._active_path):
-            archive = self._rotator.rotate(self._active_path)
-            if archive:
-                if self._compression_enabled:
-                    archive = self._rotator.compress(archive)
-                print(f"Storage: rotated to {archive}", flush=True)
+        if self._active_lines and self._rotator.needs_rotation(self._active_path):
+            self._active_fp.close()
+            try:
+                archive = self._rotator.rotate(self._active_path)
+                if archive:
+                    if os.path.exists(self._offsets_path):
+                        os.remove(self._offsets_path)
+                    if self._compression_enabled:
+                        archive = self._rotator.compress(archive)
+                    print(f"Storage: rotated to {archive}", flush=True)
+            finally:
+                # Reopen even if rotation failed, so later ingests still work
+                self._open_active()
 
         return total
 
+    def close(self) -> None:
+        """Flush and close the active NDJSON file."""
+        self._active_fp.close()
+
+    def _open_active(self) -> None:
+        """Open the active NDJSON file for appending and cache its line count."""
+        self._active_fp = open(self._active_path, "ab", buffering=1 << 20)
+        self._active_lines = 0
+        if self._active_fp.tell():
+            with open(self._active_path, "rb") as f:
+                self._active_lines = sum(1 for _ in f)
+        self._sync_offsets(self._active_lines)
+
     def _ingest_file(self, path: str) -> int:
         with open(path, "r") as f:
             entries = json.load(f)
 
-        # Count existing lines to know starting line number
-        start_line = 0
-        if os.path.exists(self._active_path):
-            with open(self._active_path, "r") as f:
-                start_line = sum(1 for _ in f)
+        start_line = self._active_lines
 
         data_file = "store_current.ndjson"
-        with open(self._active_path, "a") as f:
-            for i, entry in enumerate(entries):
-                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
-                self._indexer.add_entry(data_file, start_line + i, entry)
+        offsets = array("Q")
+        f = self._active_fp
+        pos = f.tell()
+        for i, entry in enumerate(entries):
+            line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+            offsets.append(pos)
+            f.write(line)
+            pos += len(line)
+            self._indexer.add_entry(data_file, start_line + i, entry)
+        f.flush()
+        self._active_lines += len(entries)
+
+        with open(self._offsets_path, "ab") as f:
+            f.write(offsets.tobytes())
 
         return len(entries)
+
+    def _sync_offsets(self, line_count: int) -> None:
+        """Rebuild the offsets file if it does not cover exactly *line_count* lines."""
+        itemsize = array("Q").itemsize
+        if os.path.exists(self._offsets_path):
+            if os.path.getsize(self._offsets_path) == line_count * itemsize:
+                return
+        elif line_count == 0:
+            return
+
+        offsets = array("Q")
+        if os.path.exists(self._active_path):
+            pos = 0
+            with open(self._active_path, "rb") as f:
+                for line in f:
+                    offsets.append(pos)
+                    pos += len(line)
+        with open(self._offsets_path, "wb") as f:
+            f.write(offsets.tobytes())
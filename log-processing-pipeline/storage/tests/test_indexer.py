@@ -4,7 +4,9 @@ import json
 import os
 import tempfile
 import unittest
+from unittest import mock
 
+from storage.src import indexer
 from storage.src.indexer import Indexer
 
 
@@ -55,6 +57,38 @@ class TestIndexer(unittest.TestCase):
             manifest = json.load(f)
         self.assertEqual(manifest[0]["line_numbers"], [0, 5])
 
+    def test_save_many_manifests(self):
+        idx = Indexer(self._tmpdir)
+        for i in range(10):
+            idx.add_entry("store.ndjson", i, {
+                "level": f"L{i % 5}", "timestamp": f"2026-02-{i + 1:02d}T00:00:00"
+            })
+        idx.save()
+
+        for i in range(5):
+            path = os.path.join(self._tmpdir, "level", f"L{i}", "manifest.json")
+            with open(path) as f:
+                manifest = json.load(f)
+            self.assertEqual(manifest[0]["line_numbers"], [i, i + 5])
+        self.assertEqual(len(os.listdir(os.path.join(self._tmpdir, "date"))), 10)
+
+
+    def test_known_dirs_are_bounded(self):
+        idx = Indexer(self._tmpdir)
+        with mock.patch.object(indexer, "_KNOWN_DIRS_MAX", 2):
+            for i in range(4):
+                idx.add_entry("store.ndjson", i, {"level": f"L{i}"})
+                idx.save()
+            self.assertEqual(len(idx._known_dirs), 2)
+
+            # An evicted directory is re-checked on disk and still merged
+            idx.add_entry("store.ndjson", 9, {"level": "L0"})
+            idx.save()
+        path = os.path.join(self._tmpdir, "level", "L0", "manifest.json")
+        with open(path) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest[0]["line_numbers"], [0, 9])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,17 @@
 """Tests for the storage rotator."""
 
+import gzip
 import os
 import tempfile
 import time
 import unittest
+from unittest import mock
 
+from storage.src import rotator
 from storage.src.rotator import Rotator
 
+_DATA = b"".join(b'{"line": %d, "level": "INFO"}\n' % i for i in range(1000))
+
 
 class TestRotator(unittest.TestCase):
     def setUp(self):
@@ -49,5 +54,34 @@ class TestRotator(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class TestCompress(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self._rotator = Rotator(
+            os.path.join(self._tmpdir, "active"), os.path.join(self._tmpdir, "archive"),
+            size_threshold_bytes=10, age_threshold_seconds=3600,
+        )
+        self._archive_path = os.path.join(self._tmpdir, "archive", "store_x.ndjson")
+        with open(self._archive_path, "wb") as f:
+            f.write(_DATA)
+
+    @unittest.skipUnless(rotator.zstandard is not None, "zstandard not installed")
+    def test_zstd_roundtrip(self):
+        path = self._rotator.compress(self._archive_path)
+        self.assertEqual(path, self._archive_path + ".zst")
+        self.assertFalse(os.path.exists(self._archive_path))
+        with open(path, "rb") as f:
+            reader = rotator.zstandard.ZstdDecompressor().stream_reader(f)
+            self.assertEqual(reader.read(), _DATA)
+
+    def test_gzip_fallback_roundtrip(self):
+        with mock.patch.object(rotator, "zstandard", None):
+            path = self._rotator.compress(self._archive_path)
+        self.assertEqual(path, self._archive_path + ".gz")
+        self.assertFalse(os.path.exists(self._archive_path))
+        with gzip.open(path, "rb") as f:
+            self.assertEqual(f.read(), _DATA)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,167 @@
+"""Tests for the storage engine."""
+
+import json
+import os
+import tempfile
+import unittest
+from array import array
+from unittest import mock
+
+from storage.src.indexer import Indexer
+from storage.src.rotator import Rotator
+from storage.src.state_tracker import StateTracker
+from storage.src.storage import StorageEngine
+
+
+class TestStorageOffsets(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self._input = os.path.join(self._tmpdir, "parsed")
+        self._storage = os.path.join(self._tmpdir, "storage")
+        self._active = os.path.join(self._storage, "active", "store_current.ndjson")
+        self._offsets = os.path.join(self._storage, "active", ".store_current.offsets")
+        os.makedirs(self._input)
+        self._batches = 0
+
+    def _engine(self, size_threshold_bytes: int = 5 * 1024 * 1024) -> StorageEngine:
+        rotator = Rotator(
+            os.path.join(self._storage, "active"),
+            os.path.join(self._storage, "archive"),
+            size_threshold_bytes=size_threshold_bytes,
+            age_threshold_seconds=86400,
+        )
+        engine = StorageEngine(
+            self._input, self._storage,
+            StateTracker(os.path.join(self._storage, ".state.json")),
+            Indexer(os.path.join(self._storage, "index")),
+            rotator,
+            compression_enabled=False,
+        )
+        self.addCleanup(engine.close)
+        return engine
+
+    def _write_batch(self, count: int):
+        """Drop a parsed JSON file with *count* entries of varying length."""
+        entries = [
+            {"level": "INFO", "path": "/" + "x" * (self._batches + i), "n": i}
+            for i in range(count)
+        ]
+        with open(os.path.join(self._input, f"batch_{self._batches:04d}.json"), "w") as f:
+            json.dump(entries, f)
+        self._batches += 1
+
+    def _assert_offsets_match_active(self):
+        with open(self._active, "rb") as f:
+            data = f.read()
+        expected = array("Q")
+        pos = 0
+        for line in data.splitlines(keepends=True):
+            expected.append(pos)
+            pos += len(line)
+        offsets = array("Q")
+        with open(self._offsets, "rb") as f:
+            offsets.frombytes(f.read())
+        self.assertEqual(offsets, expected)
+
+    def test_offsets_track_each_ingest(self):
+        engine = self._engine()
+        self._write_batch(3)
+        self.assertEqual(engine.poll_once(), 3)
+        self._write_batch(4)
+        self._write_batch(2)
+        self.assertEqual(engine.poll_once(), 6)
+        engine.close()
+        self._assert_offsets_match_active()
+
+    def test_offsets_continue_after_reopen(self):
+        engine = self._engine()
+        self._write_batch(3)
+        engine.poll_once()
+        engine.close()
+
+        engine = self._engine()
+        self._write_batch(5)
+        engine.poll_once()
+        engine.close()
+        self._assert_offsets_match_active()
+
+    def test_stale_offsets_rebuilt_on_open(self):
+        engine = self._engine()
+        self._write_batch(3)
+        engine.poll_once()
+        engine.close()
+        with open(self._offsets, "wb") as f:
+            f.write(array("Q", [0]).tobytes())
+
+        engine = self._engine()
+        engine.close()
+        self._assert_offsets_match_active()
+
+    def test_offsets_restart_after_rotation(self):
+        engine = self._engine(size_threshold_bytes=1)
+        self._write_batch(3)
+        engine.poll_once()
+        self.assertEqual(os.path.getsize(self._active), 0)
+        self.assertFalse(os.path.exists(self._offsets))
+        archives = os.listdir(os.path.join(self._storage, "archive"))
+        self.assertEqual(len(archives), 1)
+
+        engine.close()
+
+        engine = self._engine()
+        self._write_batch(4)
+        engine.poll_once()
+        engine.close()
+        self._assert_offsets_match_active()
+        with open(self._active) as f:
+            self.assertEqual(len(f.readlines()), 4)
+
+    def test_each_ingest_is_readable_before_close(self):
+        engine = self._engine()
+        self._write_batch(2)
+        engine.poll_once()
+        with open(self._active) as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self._write_batch(3)
+        engine.poll_once()
+        with open(self._active) as f:
+            self.assertEqual(len(f.readlines()), 5)
+        self._assert_offsets_match_active()
+
+    def test_ingest_after_rotation_goes_to_new_active_file(self):
+        engine = self._engine()
+        self._write_batch(2)
+        with mock.patch.object(engine._rotator, "needs_rotation", return_value=True):
+            engine.poll_once()
+        self.assertEqual(os.path.getsize(self._active), 0)
+        self._write_batch(3)
+        engine.poll_once()
+        with open(self._active) as f:
+            self.assertEqual(len(f.readlines()), 3)
+        self._assert_offsets_match_active()
+
+    def test_failed_rotation_keeps_engine_usable(self):
+        engine = self._engine(size_threshold_bytes=1)
+        self._write_batch(2)
+        with mock.patch.object(engine._rotator, "rotate", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                engine.poll_once()
+        self._write_batch(3)
+        engine.poll_once()
+        archives = os.listdir(os.path.join(self._storage, "archive"))
+        self.assertEqual(len(archives), 1)
+        with open(os.path.join(self._storage, "archive", archives[0])) as f:
+            self.assertEqual(len(f.readlines()), 5)
+
+    def test_close_is_idempotent(self):
+        engine = self._engine()
+        self._write_batch(1)
+        engine.poll_once()
+        engine.close()
+        engine.close()
+        with open(self._active) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -60,6 +60,7 @@ class TestIntegration(unittest.TestCase):
             age_threshold_seconds=86400,
         )
         engine = StorageEngine(parsed_dir, storage_dir, s_tracker, indexer, rotator)
+        self.addCleanup(engine.close)
         n_stored = engine.poll_once()
         self.assertEqual(n_stored, 20)
 
@@ -5,10 +5,13 @@ from argparse import ArgumentParser
 from itertools import islice
 
 from src.filters import build_filter_chain
-from src.formatter import get_formatter
+from src.formatter import get_byte_formatter
 from src.parser import parse_line
 from src.reader import expand_paths, read_multiple, tail_file
 
+# Output is written to stdout in chunks of about this many bytes.
+WRITE_CHUNK_SIZE = 1 << 16
+
 
 def build_parser() -> ArgumentParser:
     """Build the CLI argument parser."""
@@ -81,7 +84,7 @@ def run_pipeline(args):
     filter_fn = build_filter_chain(args)
 
     # Build formatter
-    formatter = get_formatter(output_format=args.output, color=args.color)
+    formatter = get_byte_formatter(output_format=args.output, color=args.color)
 
     if args.tail:
         # Tail mode: single file, stream forever
@@ -103,8 +106,12 @@ def run_pipeline(args):
 
     # Stats mode
     if args.stats:
-        from src.stats import compute_stats, format_stats_text, format_stats_json
-        stats = compute_stats(entries)
+        from src import stats as stats_mod
+        from src.stats import format_stats_text, format_stats_json
+        if len(paths) > 1:
+            stats = stats_mod.compute_stats_parallel(paths, args)
+        else:
+            stats = stats_mod.stats_for_file(paths[0], args)
         if args.output == "json":
             print(format_stats_json(stats))
         else:
@@ -115,9 +122,24 @@ def run_pipeline(args):
     if args.lines:
         entries = islice(entries, args.lines)
 
-    # Output
+    # Output — tail mode must show each entry as soon as it arrives
+    write_entries(entries, formatter, flush_each=args.tail)
+
+
+def write_entries(entries, formatter, flush_each: bool = False) -> None:
+    """Write formatted entries to stdout, batching them into large writes."""
+    out = sys.stdout.buffer
+    buf = bytearray()
     for entry in entries:
-        print(formatter(entry))
+        buf += formatter(entry)
+        buf += b"\n"
+        if flush_each or len(buf) >= WRITE_CHUNK_SIZE:
+            out.write(buf)
+            out.flush()
+            buf.clear()
+    if buf:
+        out.write(buf)
+    out.flush()
 
 
 def main():
@@ -27,9 +27,7 @@ def filter_by_time_range(entry: LogEntry, time_range_str: str) -> bool:
 
     Handles cross-midnight ranges (e.g. 23:00-01:00).
     """
-    start_str, end_str = time_range_str.split("-")
-    start = time.fromisoformat(start_str.strip())
-    end = time.fromisoformat(end_str.strip())
+    start, end = _parse_time_range(time_range_str)
     entry_time = entry.timestamp.time()
 
     if start <= end:
@@ -39,33 +37,52 @@ def filter_by_time_range(entry: LogEntry, time_range_str: str) -> bool:
         return entry_time >= start or entry_time <= end
 
 
+def has_filters(args) -> bool:
+    """True if *args* requests any entry filter."""
+    return any(getattr(args, name, None) for name in ("level", "search", "date", "time_range"))
+
+
+def _parse_time_range(time_range_str: str) -> tuple[time, time]:
+    start_str, end_str = time_range_str.split("-")
+    return time.fromisoformat(start_str.strip()), time.fromisoformat(end_str.strip())
+
+
 def build_filter_chain(args) -> Callable[[LogEntry], bool]:
     """Combine all active filters from parsed args into a single callable.
 
-    Returns a function that ANDs all active predicates together.
+    Returns a function that ANDs all active predicates together. The
+    function is generated at build time with only the enabled checks
+    inlined, so each entry costs one call rather than one per predicate.
+    Argument values are bound as globals of the generated function, never
+    spliced into its source.
     """
-    predicates = []
+    clauses = []
+    namespace = {}
 
     if getattr(args, "level", None):
-        level = args.level
-        predicates.append(lambda entry, l=level: filter_by_level(entry, l))
+        namespace["_level"] = args.level.upper()
+        clauses.append("e.level == _level")
 
     if getattr(args, "search", None):
-        keyword = args.search
-        predicates.append(lambda entry, k=keyword: filter_by_search(entry, k))
+        namespace["_keyword"] = args.search.lower()
+        clauses.append("_keyword in e.message.lower()")
 
     if getattr(args, "date", None):
-        date_str = args.date
-        predicates.append(lambda entry, d=date_str: filter_by_date(entry, d))
+        namespace["_date"] = datetime.strptime(args.date, "%Y-%m-%d").date()
+        clauses.append("e.timestamp.date() == _date")
 
     if getattr(args, "time_range", None):
-        time_range_str = args.time_range
-        predicates.append(lambda entry, t=time_range_str: filter_by_time_range(entry, t))
-
-    if not predicates:
+        start, end = _parse_time_range(args.time_range)
+        namespace["_start"], namespace["_end"] = start, end
+        if start <= end:
+            clauses.append("_start <= e.timestamp.time() <= _end")
+        else:
+            # Cross-midnight: e.g. 23:00-01:00
+            clauses.append("((_t := e.timestamp.time()) >= _start or _t <= _end)")
+
+    if not clauses:
         return lambda entry: True
 
-    def combined(entry: LogEntry) -> bool:
-        return all(p(entry) for p in predicates)
-
-    return combined
+    source = "def combined(e):\n    return " + " and ".join(clauses) + "\n"
+    exec(compile(source, "<filter_chain>", "exec"), namespace)
+    return namespace["combined"]
@@ -1,9 +1,15 @@
 """Output formatters — text, JSON (NDJSON), colorized (ANSI)."""
 
+import json
 from typing import Callable
 
 from src.parser import LogEntry
 
+try:
+    import orjson
+except ImportError:  # optional — faster JSON encoding
+    orjson = None
+
 # ANSI color codes
 COLORS = {
     "DEBUG": "\033[36m",   # cyan
@@ -14,28 +20,49 @@ COLORS = {
 }
 RESET = "\033[0m"
 
+# Stdlib fallback encoder matching orjson's output byte for byte: compact
+# separators and raw (unescaped) non-ASCII text.
+_encode_json = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+# "[<color>LEVEL<reset>]" for each known level, built once at import.
+_PAINTED_LEVELS = {level: f"[{color}{level}{RESET}]" for level, color in COLORS.items()}
+
 
 def format_text(entry: LogEntry) -> str:
     """Return the raw log line."""
     return entry.raw
 
 
-def format_json(entry: LogEntry) -> str:
-    """Return NDJSON — one JSON object per line, compatible with jq."""
-    import json
-    return json.dumps({
+def _entry_to_dict(entry: LogEntry) -> dict:
+    return {
         "timestamp": entry.timestamp.isoformat(),
         "level": entry.level,
         "message": entry.message,
         "source_file": entry.source_file,
-    })
+    }
+
+
+def format_json(entry: LogEntry) -> str:
+    """Return NDJSON — one JSON object per line, compatible with jq."""
+    data = _entry_to_dict(entry)
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return _encode_json(data)
+
+
+def format_json_bytes(entry: LogEntry) -> bytes:
+    """format_json encoded as UTF-8, without a str round trip under orjson."""
+    if orjson is not None:
+        return orjson.dumps(_entry_to_dict(entry))
+    return format_json(entry).encode("utf-8")
 
 
 def format_color(entry: LogEntry) -> str:
     """Return the log line with ANSI-colored level."""
-    color = COLORS.get(entry.level, "")
-    ts = entry.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-    return f"[{ts}] [{color}{entry.level}{RESET}] {entry.message}"
+    painted = _PAINTED_LEVELS.get(entry.level) or f"[{entry.level}{RESET}]"
+    # Parsed timestamps have whole seconds, so isoformat matches
+    # "%Y-%m-%d %H:%M:%S" without strftime's per-call format parsing.
+    return f"[{entry.timestamp.isoformat(' ')}] {painted} {entry.message}"
 
 
 def get_formatter(output_format: str = "text", color: bool = False) -> Callable[[LogEntry], str]:
@@ -45,3 +72,11 @@ def get_formatter(output_format: str = "text", color: bool = False) -> Callable[
     if color:
         return format_color
     return format_text
+
+
+def get_byte_formatter(output_format: str = "text", color: bool = False) -> Callable[[LogEntry], bytes]:
+    """Like get_formatter, but the returned callable produces UTF-8 bytes."""
+    if output_format == "json":
+        return format_json_bytes
+    formatter = get_formatter(output_format, color)
+    return lambda entry: formatter(entry).encode("utf-8")
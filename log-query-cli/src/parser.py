@@ -1,17 +1,27 @@
 """Log line parser — frozen dataclass + compiled regex."""
 
 import re
+import sys
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, Iterator
 
 LOG_PATTERN = re.compile(
-    r"^\[(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\]\s+\[(\w+)\]\s+(.*)"
+    r"^\[(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\]\s+\[(\w+)\]\s+([^\n]*)"
 )
 
 TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Canonical level strings. Every entry with a given level shares one str
+# object, so level comparisons and Counter lookups hit the identity fast path.
+_LEVEL_INTERN = {
+    name: name
+    for name in ("DEBUG", "INFO", "WARN", "WARNING", "ERROR", "TRACE", "CRITICAL", "FATAL")
+}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class LogEntry:
     timestamp: datetime
     level: str
@@ -20,23 +30,74 @@ class LogEntry:
     source_file: str
 
 
+@lru_cache(maxsize=4096)
+def _parse_timestamp(timestamp_str: str) -> datetime | None:
+    """Parse a timestamp string, memoized since consecutive lines often share one.
+
+    Returns None for invalid dates so repeated bad values short-circuit too.
+    """
+    # LOG_PATTERN guarantees "YYYY-MM-DD<whitespace>HH:MM:SS", so slice the
+    # fields out directly instead of interpreting TIMESTAMP_FORMAT.
+    date_str, time_str = timestamp_str.split()
+    try:
+        return datetime(
+            int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+            int(time_str[0:2]), int(time_str[3:5]), int(time_str[6:8]),
+        )
+    except ValueError:
+        return None
+
+
+def _canonical_level(level: str) -> str:
+    """Return the shared upper-case str for *level*."""
+    canonical = _LEVEL_INTERN.get(level)
+    if canonical is None:
+        canonical = sys.intern(level.upper())
+    return canonical
+
+
 def parse_line(line: str, source_file: str = "") -> LogEntry | None:
     """Parse a single log line into a LogEntry. Returns None for unparseable lines."""
     stripped = line.rstrip("\n")
+    # Cheap rejects before entering the regex engine: every log line opens
+    # with "[" and closes the timestamp bracket at index 20 or later.
+    if not stripped.startswith("[") or stripped.find("]", 20) < 0:
+        return None
     match = LOG_PATTERN.match(stripped)
     if not match:
         return None
 
     timestamp_str, level, message = match.groups()
-    try:
-        timestamp = datetime.strptime(timestamp_str, TIMESTAMP_FORMAT)
-    except ValueError:
+    timestamp = _parse_timestamp(timestamp_str)
+    if timestamp is None:
         return None
 
     return LogEntry(
         timestamp=timestamp,
-        level=level.upper(),
+        level=_canonical_level(level),
         message=message,
         raw=stripped,
         source_file=source_file,
     )
+
+
+def iter_parsed_for_stats(lines: Iterable[str]) -> Iterator[tuple[str, str, str]]:
+    """Yield (level, hour_key, message) for each parseable line.
+
+    A lighter-weight parse for stats: no LogEntry is built and the hour
+    bucket ("YYYY-MM-DD HH:00") is sliced from the timestamp text. Lines
+    parse_line would reject are skipped.
+    """
+    match = LOG_PATTERN.match
+    for line in lines:
+        stripped = line.rstrip("\n")
+        if not stripped.startswith("[") or stripped.find("]", 20) < 0:
+            continue
+        m = match(stripped)
+        if m is None:
+            continue
+        timestamp_str, level, message = m.groups()
+        if _parse_timestamp(timestamp_str) is None:
+            continue
+        # Date is the first 10 chars, HH:MM:SS the last 8
+        yield _canonical_level(level), timestamp_str[:10] + " " + timestamp_str[-8:-6] + ":00", message
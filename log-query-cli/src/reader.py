@@ -1,14 +1,27 @@
 """Generator-based file reading, glob expansion, and tail."""
 
+import ctypes
+import fnmatch
 import glob
 import os
+import select
+import stat
+import sys
 import time
 from typing import Generator
 
+# inotify(7) constants from <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+
 
 def read_lines(filepath: str) -> Generator[tuple[str, str], None, None]:
-    """Yield (line, filepath) for each line in a single file."""
-    with open(filepath, "r") as f:
+    """Yield (line, filepath) for each line in a single file.
+
+    Uses a 1 MiB read buffer so large logs are scanned with few syscalls.
+    """
+    with open(filepath, "r", buffering=1 << 20) as f:
         for line in f:
             yield line, filepath
 
@@ -19,6 +32,36 @@ def read_multiple(paths: list[str]) -> Generator[tuple[str, str], None, None]:
         yield from read_lines(path)
 
 
+def _is_glob(path: str) -> bool:
+    return any(c in path for c in ("*", "?", "["))
+
+
+def _glob_files(pattern: str) -> list[str]:
+    """Return regular files matching *pattern*, sorted.
+
+    When only the last path component has wildcards, a single os.scandir
+    of its directory is used so file types come from the cached dirent
+    instead of a stat per match. Wildcards in directory components fall
+    back to glob.
+    """
+    dirname, basename = os.path.split(pattern)
+    if _is_glob(dirname):
+        return sorted(m for m in glob.glob(pattern) if os.path.isfile(m))
+
+    include_hidden = basename.startswith(".")
+    matches = []
+    try:
+        with os.scandir(dirname or ".") as it:
+            for entry in it:
+                if entry.name.startswith(".") and not include_hidden:
+                    continue  # glob skips hidden files unless asked for
+                if fnmatch.fnmatchcase(entry.name, basename) and entry.is_file():
+                    matches.append(os.path.join(dirname, entry.name))
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    return sorted(matches)
+
+
 def expand_paths(raw_paths: list[str]) -> list[str]:
     """Expand globs, deduplicate, and validate that files exist.
 
@@ -29,14 +72,17 @@ def expand_paths(raw_paths: list[str]) -> list[str]:
     seen = set()
 
     for raw in raw_paths:
-        if any(c in raw for c in ("*", "?", "[")):
-            matches = sorted(glob.glob(raw))
-            for m in matches:
+        if _is_glob(raw):
+            for m in _glob_files(raw):
                 if m not in seen:
                     seen.add(m)
                     expanded.append(m)
         else:
-            if not os.path.isfile(raw):
+            try:
+                is_file = stat.S_ISREG(os.stat(raw).st_mode)
+            except OSError:
+                is_file = False
+            if not is_file:
                 raise FileNotFoundError(f"File not found: {raw}")
             if raw not in seen:
                 seen.add(raw)
@@ -48,20 +94,66 @@ def expand_paths(raw_paths: list[str]) -> list[str]:
     return expanded
 
 
+class _ModifyWatch:
+    """Block until a file is modified, using Linux inotify through libc."""
+
+    def __init__(self, filepath: str):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, os.fsencode(filepath), _IN_MODIFY) < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, "inotify_add_watch failed")
+
+    def wait(self, timeout: float) -> None:
+        """Wait up to *timeout* seconds for a modify event, then drain events."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if ready:
+            try:
+                while os.read(self._fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _open_watch(filepath: str) -> _ModifyWatch | None:
+    """Return an inotify watch on *filepath*, or None where unsupported."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _ModifyWatch(filepath)
+    except (OSError, AttributeError):
+        return None
+
+
 def tail_file(filepath: str, poll_interval: float = 0.1) -> Generator[tuple[str, str], None, None]:
     """Seek to end of file and yield new lines as they appear.
 
-    Polls with time.sleep(poll_interval). Runs until interrupted.
+    On Linux, waits for inotify modify events between reads; elsewhere
+    polls with time.sleep(poll_interval). Runs until interrupted.
     """
-    with open(filepath, "r") as f:
-        f.seek(0, os.SEEK_END)
-        buffer = ""
-        while True:
-            chunk = f.read()
-            if chunk:
-                buffer += chunk
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    yield line + "\n", filepath
-            else:
-                time.sleep(poll_interval)
+    watch = _open_watch(filepath)
+    try:
+        with open(filepath, "r") as f:
+            f.seek(0, os.SEEK_END)
+            buffer = ""
+            while True:
+                chunk = f.read()
+                if chunk:
+                    buffer += chunk
+                    while "\n" in buffer:
+                        line, buffer = buffer.split("\n", 1)
+                        yield line + "\n", filepath
+                elif watch is not None:
+                    # Timeout keeps the loop alive if an event is ever missed
+                    watch.wait(1.0)
+                else:
+                    time.sleep(poll_interval)
+    finally:
+        if watch is not None:
+            watch.close()
@@ -1,11 +1,27 @@
 """Statistics — level counts, entries per hour, common errors."""
 
 import json
+import os
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from itertools import chain, islice
+from operator import itemgetter
 from typing import Iterable
 
-from src.parser import LogEntry
+from src.filters import build_filter_chain, has_filters
+from src.parser import LogEntry, iter_parsed_for_stats, parse_line
+from src.reader import read_lines
+
+try:
+    import orjson
+except ImportError:  # optional — faster JSON encoding
+    orjson = None
+
+# Rows aggregated per Counter.update call in _compute_stats_rows
+_ROW_BATCH = 4096
+_LEVEL = itemgetter(0)
+_HOUR_KEY = itemgetter(1)
 
 
 @dataclass
@@ -13,23 +29,47 @@ class LogStats:
     total_entries: int = 0
     level_counts: dict[str, int] = field(default_factory=dict)
     entries_per_hour: dict[str, int] = field(default_factory=dict)
-    error_messages: list[str] = field(default_factory=list)
+    # Distinct ERROR messages -> occurrence count, in first-seen order
+    error_messages: Counter[str] = field(default_factory=Counter)
+
+    def __post_init__(self):
+        if not isinstance(self.error_messages, Counter):
+            self.error_messages = Counter(self.error_messages)
+
+
+def compute_stats(entries: Iterable[LogEntry] | Iterable[tuple[str, str, str]]) -> LogStats:
+    """Consume an entry stream and produce aggregated statistics.
 
+    Accepts LogEntry objects or the (level, hour_key, message) tuples
+    produced by iter_parsed_for_stats.
+    """
+    entries = iter(entries)
+    first = next(entries, None)
+    if first is None:
+        return LogStats()
+    if isinstance(first, tuple):
+        return _compute_stats_rows(chain([first], entries))
+    entries = chain([first], entries)
 
-def compute_stats(entries: Iterable[LogEntry]) -> LogStats:
-    """Consume an entry stream and produce aggregated statistics."""
     level_counter = Counter()
     hour_counter = Counter()
-    error_msgs = []
+    error_msgs = Counter()
     total = 0
+    # Logs are mostly time-ordered, so only re-format the hour key when the
+    # hour actually changes.
+    last_hour = None
+    hour_key = ""
 
     for entry in entries:
         total += 1
         level_counter[entry.level] += 1
-        hour_key = entry.timestamp.strftime("%Y-%m-%d %H:00")
+        hour = entry.timestamp.replace(minute=0, second=0, microsecond=0)
+        if hour != last_hour:
+            last_hour = hour
+            hour_key = hour.strftime("%Y-%m-%d %H:00")
         hour_counter[hour_key] += 1
         if entry.level == "ERROR":
-            error_msgs.append(entry.message)
+            error_msgs[entry.message] += 1
 
     return LogStats(
         total_entries=total,
@@ -39,6 +79,69 @@ def compute_stats(entries: Iterable[LogEntry]) -> LogStats:
     )
 
 
+def _compute_stats_rows(rows: Iterable[tuple[str, str, str]]) -> LogStats:
+    """compute_stats over pre-projected (level, hour_key, message) rows.
+
+    Rows are taken in fixed-size batches so levels and hour keys are
+    counted by Counter.update's C loop rather than one += per row.
+    """
+    level_counter = Counter()
+    hour_counter = Counter()
+    error_msgs = Counter()
+    total = 0
+
+    rows = iter(rows)
+    while batch := list(islice(rows, _ROW_BATCH)):
+        total += len(batch)
+        level_counter.update(map(_LEVEL, batch))
+        hour_counter.update(map(_HOUR_KEY, batch))
+        error_msgs.update([message for level, _, message in batch if level == "ERROR"])
+
+    return LogStats(
+        total_entries=total,
+        level_counts=dict(level_counter.most_common()),
+        entries_per_hour=dict(sorted(hour_counter.items())),
+        error_messages=error_msgs,
+    )
+
+
+def stats_for_file(path: str, args=None) -> LogStats:
+    """Compute stats for a single file, applying any filters in *args*."""
+    if not has_filters(args):
+        return compute_stats(iter_parsed_for_stats(line for line, _ in read_lines(path)))
+    filter_fn = build_filter_chain(args)
+    entries = (parse_line(line, source_file=p) for line, p in read_lines(path))
+    return compute_stats(e for e in entries if e is not None and filter_fn(e))
+
+
+def merge_stats(parts: Iterable[LogStats]) -> LogStats:
+    """Combine per-file stats, in order, into one LogStats."""
+    level_counter = Counter()
+    hour_counter = Counter()
+    error_msgs = Counter()
+    total = 0
+    for part in parts:
+        total += part.total_entries
+        level_counter.update(part.level_counts)
+        hour_counter.update(part.entries_per_hour)
+        error_msgs.update(part.error_messages)
+
+    return LogStats(
+        total_entries=total,
+        level_counts=dict(level_counter.most_common()),
+        entries_per_hour=dict(sorted(hour_counter.items())),
+        error_messages=error_msgs,
+    )
+
+
+def compute_stats_parallel(paths: list[str], args=None) -> LogStats:
+    """Compute stats for several files at once, one worker process per file."""
+    workers = min(len(paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(stats_for_file, paths, [args] * len(paths))
+        return merge_stats(parts)
+
+
 def format_stats_text(stats: LogStats) -> str:
     """Human-readable stats summary."""
     lines = []
@@ -47,18 +150,19 @@ def format_stats_text(stats: LogStats) -> str:
 
     lines.append("Level counts:")
     for level, count in stats.level_counts.items():
-        lines.append(f"  {level:8s} {count}")
+        lines.append("  %-8s %d" % (level, count))
     lines.append("")
 
     lines.append("Entries per hour:")
     for hour, count in stats.entries_per_hour.items():
-        lines.append(f"  {hour}  {count}")
+        lines.append("  %s  %d" % (hour, count))
     lines.append("")
 
     if stats.error_messages:
-        lines.append(f"Error messages ({len(stats.error_messages)}):")
-        for msg in stats.error_messages:
-            lines.append(f"  - {msg}")
+        total = sum(stats.error_messages.values())
+        lines.append(f"Error messages ({total}, {len(stats.error_messages)} distinct):")
+        for msg, count in stats.error_messages.most_common():
+            lines.append(f"  - [{count}] {msg}")
     else:
         lines.append("No error messages.")
 
@@ -67,9 +171,13 @@ def format_stats_text(stats: LogStats) -> str:
 
 def format_stats_json(stats: LogStats) -> str:
     """JSON stats output."""
-    return json.dumps({
+    data = {
         "total_entries": stats.total_entries,
         "level_counts": stats.level_counts,
         "entries_per_hour": stats.entries_per_hour,
-        "error_messages": stats.error_messages,
-    }, indent=2)
+        "error_messages": [msg for msg, _ in stats.error_messages.most_common()],
+        "error_counts": dict(stats.error_messages.most_common()),
+    }
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False)
@@ -129,6 +129,19 @@ class TestBuildFilterChain(unittest.TestCase):
             chain(_entry(ts="2025-05-16 14:30:00", level="ERROR", message="Connection timeout"))
         )
 
+    def test_cross_midnight_time_range(self):
+        args = Namespace(level=None, search=None, date=None, time_range="23:00-01:00")
+        chain = build_filter_chain(args)
+        self.assertTrue(chain(_entry(ts="2025-05-15 23:30:00")))
+        self.assertTrue(chain(_entry(ts="2025-05-16 00:30:00")))
+        self.assertFalse(chain(_entry(ts="2025-05-15 12:00:00")))
+
+    def test_search_with_quotes(self):
+        args = Namespace(level=None, search="it's \"done\"", date=None, time_range=None)
+        chain = build_filter_chain(args)
+        self.assertTrue(chain(_entry(message="Job: It's \"DONE\" now")))
+        self.assertFalse(chain(_entry(message="Job done")))
+
     def test_missing_attributes_ignored(self):
         args = Namespace()
         chain = build_filter_chain(args)
@@ -2,15 +2,19 @@
 
 import json
 import unittest
+from unittest import mock
 from datetime import datetime
 
+from src import formatter
 from src.parser import LogEntry
 from src.formatter import (
     COLORS,
     RESET,
     format_color,
     format_json,
+    format_json_bytes,
     format_text,
+    get_byte_formatter,
     get_formatter,
 )
 
@@ -49,6 +53,18 @@ class TestFormatJson(unittest.TestCase):
         parsed = json.loads(format_json(entry))
         self.assertEqual(parsed["timestamp"], "2025-05-15T14:30:00")
 
+    def test_bytes_variant_matches(self):
+        entry = _entry(message="Caf\u00e9 ready")
+        self.assertEqual(format_json_bytes(entry), format_json(entry).encode("utf-8"))
+
+    @unittest.skipUnless(formatter.orjson is not None, "orjson not installed")
+    def test_stdlib_fallback_matches_orjson(self):
+        entry = _entry(message='Caf\u00e9 "quoted" \\ tab\t \u2603')
+        fast = format_json(entry)
+        with mock.patch.object(formatter, "orjson", None):
+            self.assertEqual(format_json(entry), fast)
+            self.assertEqual(format_json_bytes(entry), fast.encode("utf-8"))
+
 
 class TestFormatColor(unittest.TestCase):
     def test_info_uses_green(self):
@@ -86,5 +102,14 @@ class TestGetFormatter(unittest.TestCase):
         self.assertEqual(fmt, format_json)
 
 
+class TestGetByteFormatter(unittest.TestCase):
+    def test_json_format(self):
+        self.assertEqual(get_byte_formatter(output_format="json"), format_json_bytes)
+
+    def test_text_is_encoded(self):
+        entry = _entry()
+        self.assertEqual(get_byte_formatter()(entry), entry.raw.encode("utf-8"))
+
+
 if __name__ == "__main__":
     unittest.main()
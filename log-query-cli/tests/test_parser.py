@@ -3,7 +3,7 @@
 import unittest
 from datetime import datetime
 
-from src.parser import LogEntry, parse_line, LOG_PATTERN
+from src.parser import LogEntry, iter_parsed_for_stats, parse_line, LOG_PATTERN
 
 
 class TestLogPattern(unittest.TestCase):
@@ -26,6 +26,12 @@ class TestLogPattern(unittest.TestCase):
         self.assertEqual(m.group(2), "ERROR")
         self.assertEqual(m.group(3), "Something broke")
 
+    def test_any_whitespace_between_date_and_time(self):
+        for sep in (" ", "  ", "\t", "\x0b", "\u00a0"):
+            line = f"[2025-05-15{sep}14:30:00] [INFO] ok"
+            self.assertIsNotNone(LOG_PATTERN.match(line), repr(sep))
+            self.assertEqual(parse_line(line).timestamp, datetime(2025, 5, 15, 14, 30, 0))
+
 
 class TestParseLine(unittest.TestCase):
     """Verify parse_line converts raw lines to LogEntry or None."""
@@ -52,6 +58,12 @@ class TestParseLine(unittest.TestCase):
         self.assertIsNotNone(entry)
         self.assertEqual(entry.level, "INFO")
 
+    def test_level_with_digits_and_underscores(self):
+        for level in ("LEVEL_1", "L2"):
+            entry = parse_line(f"[2025-05-15 14:30:00] [{level}] custom level")
+            self.assertIsNotNone(entry)
+            self.assertEqual(entry.level, level)
+
     def test_returns_none_for_empty_line(self):
         self.assertIsNone(parse_line(""))
 
@@ -80,6 +92,24 @@ class TestParseLine(unittest.TestCase):
         self.assertEqual(entry.source_file, "")
 
 
+class TestIterParsedForStats(unittest.TestCase):
+    """Verify the stats projection matches what parse_line accepts."""
+
+    def test_yields_level_hour_message(self):
+        lines = [
+            "[2025-05-15 14:30:00] [info] Server started\n",
+            "[2025-05-15\t09:05:59] [ERROR] Disk full\n",
+        ]
+        self.assertEqual(list(iter_parsed_for_stats(lines)), [
+            ("INFO", "2025-05-15 14:00", "Server started"),
+            ("ERROR", "2025-05-15 09:00", "Disk full"),
+        ])
+
+    def test_skips_unparseable_lines(self):
+        lines = ["", "garbage\n", "[9999-99-99 99:99:99] [INFO] bad date\n"]
+        self.assertEqual(list(iter_parsed_for_stats(lines)), [])
+
+
 class TestLogEntryFrozen(unittest.TestCase):
     """Verify LogEntry is immutable."""
 
@@ -1,11 +1,23 @@
 """Tests for src/stats.py"""
 
 import json
+import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
+from argparse import Namespace
+from collections import Counter
 from datetime import datetime
 
-from src.parser import LogEntry
-from src.stats import LogStats, compute_stats, format_stats_json, format_stats_text
+from src import stats as stats_module
+from src.parser import LogEntry, iter_parsed_for_stats, parse_line
+from src.reader import read_lines
+from src.stats import (
+    LogStats, compute_stats, compute_stats_parallel, format_stats_json, format_stats_text,
+)
+
+SAMPLE_LOG = os.path.join(os.path.dirname(__file__), "..", "logs", "sample.log")
 
 
 def _entry(
@@ -27,7 +39,7 @@ class TestComputeStats(unittest.TestCase):
         stats = compute_stats(iter([]))
         self.assertEqual(stats.total_entries, 0)
         self.assertEqual(stats.level_counts, {})
-        self.assertEqual(stats.error_messages, [])
+        self.assertEqual(stats.error_messages, Counter())
 
     def test_counts_entries(self):
         entries = [_entry(), _entry(), _entry()]
@@ -67,10 +79,62 @@ class TestComputeStats(unittest.TestCase):
         self.assertIn("Disk full", stats.error_messages)
         self.assertIn("Timeout", stats.error_messages)
 
+    def test_error_messages_deduplicated(self):
+        entries = [
+            _entry(level="ERROR", message="Disk full"),
+            _entry(level="ERROR", message="Timeout"),
+            _entry(level="ERROR", message="Disk full"),
+        ]
+        stats = compute_stats(iter(entries))
+        self.assertEqual(stats.error_messages, Counter({"Disk full": 2, "Timeout": 1}))
+
+    def test_accepts_projected_rows(self):
+        entries = (parse_line(line, path) for line, path in read_lines(SAMPLE_LOG))
+        expected = compute_stats(e for e in entries if e is not None)
+        rows = iter_parsed_for_stats(line for line, _ in read_lines(SAMPLE_LOG))
+        self.assertEqual(compute_stats(rows), expected)
+
+    def test_projected_rows_across_batches(self):
+        entries = [e for e in (parse_line(l, p) for l, p in read_lines(SAMPLE_LOG)) if e is not None]
+        rows = list(iter_parsed_for_stats(line for line, _ in read_lines(SAMPLE_LOG)))
+        with mock.patch.object(stats_module, "_ROW_BATCH", 3):
+            stats = compute_stats(iter(rows))
+        expected = compute_stats(iter(entries))
+        self.assertEqual(stats, expected)
+        self.assertEqual(list(stats.level_counts), list(expected.level_counts))
+        self.assertEqual(list(stats.error_messages), list(expected.error_messages))
+
     def test_no_errors_empty_list(self):
         entries = [_entry(level="INFO")]
         stats = compute_stats(iter(entries))
-        self.assertEqual(stats.error_messages, [])
+        self.assertEqual(stats.error_messages, Counter())
+
+
+class TestComputeStatsParallel(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self._paths = []
+        for name in ("a.log", "b.log"):
+            path = os.path.join(self._tmpdir, name)
+            shutil.copy(SAMPLE_LOG, path)
+            self._paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmpdir)
+
+    def test_matches_sequential_stats(self):
+        single = compute_stats(
+            e for e in (parse_line(l, p) for l, p in read_lines(SAMPLE_LOG)) if e is not None
+        )
+        merged = compute_stats_parallel(self._paths)
+        self.assertEqual(merged.total_entries, 2 * single.total_entries)
+        self.assertEqual(merged.level_counts, {k: 2 * v for k, v in single.level_counts.items()})
+        self.assertEqual(merged.error_messages, single.error_messages + single.error_messages)
+
+    def test_applies_filters(self):
+        args = Namespace(level="ERROR", search=None, date=None, time_range=None)
+        merged = compute_stats_parallel(self._paths, args)
+        self.assertEqual(list(merged.level_counts), ["ERROR"])
 
 
 class TestFormatStatsText(unittest.TestCase):
@@ -112,6 +176,19 @@ class TestFormatStatsJson(unittest.TestCase):
         self.assertEqual(parsed["total_entries"], 5)
         self.assertEqual(parsed["level_counts"]["INFO"], 3)
         self.assertEqual(parsed["error_messages"], ["err1"])
+        self.assertEqual(parsed["error_counts"], {"err1": 1})
+
+    @unittest.skipUnless(stats_module.orjson is not None, "orjson not installed")
+    def test_stdlib_fallback_matches_orjson(self):
+        stats = LogStats(
+            total_entries=1,
+            level_counts={"ERROR": 1},
+            entries_per_hour={"2025-05-15 14:00": 1},
+            error_messages=["Caf\u00e9 down"],
+        )
+        fast = format_stats_json(stats)
+        with mock.patch.object(stats_module, "orjson", None):
+            self.assertEqual(format_stats_json(stats), fast)
 
 
 if __name__ == "__main__":
@@ -2,21 +2,17 @@
 
 import logging
 import signal
-import sys
 import threading
 
 from src.config import load_config
+from src.log_setup import configure_logging
 from src.metrics import MetricsReporter
 from src.resilient_shipper import ResilientLogShipper
 from src.shipper import LogShipper
 
 
 def main():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
-        stream=sys.stderr,
-    )
+    log_listener = configure_logging()
 
     config = load_config()
     shutdown_event = threading.Event()
@@ -51,6 +47,7 @@ def main():
     finally:
         if reporter:
             reporter.stop()
+        log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -3,35 +3,33 @@
 import logging
 import os
 import signal
-import sys
 import threading
 
+from src.log_setup import configure_logging
 from src.server import SimpleLogServer
 
 
 def main():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
-        stream=sys.stderr,
-    )
+    log_listener = configure_logging()
 
     host = os.environ.get("SERVER_HOST", "0.0.0.0")
     port = int(os.environ.get("SERVER_PORT", "9000"))
     shutdown_event = threading.Event()
+    server = SimpleLogServer(host, port, shutdown_event)
 
     def signal_handler(signum, frame):
         logging.getLogger(__name__).info("Received signal %d, shutting down...", signum)
-        shutdown_event.set()
+        # The server blocks in select() without a timeout; stop() wakes it
+        server.stop()
 
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    server = SimpleLogServer(host, port, shutdown_event)
     try:
         server.start()
     finally:
         server.stop()
+        log_listener.stop()
 
 
 if __name__ == "__main__":
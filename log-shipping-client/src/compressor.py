@@ -1,25 +1,101 @@
-"""Gzip compression with length-prefixed framing for TCP transport."""
+"""Gzip or zstd compression with length-prefixed framing for TCP transport."""
 
 import gzip
 import struct
+import threading
+import zlib
 
+try:
+    from isal import isal_zlib as _zlib
+    _MAX_LEVEL = 3  # ISA-L levels run 0-3
+except ImportError:  # optional — ISA-L accelerated deflate, same output format
+    _zlib = zlib
+    _MAX_LEVEL = 9
 
-def compress_payload(data: bytes) -> bytes:
-    """Compress data with gzip and prepend a 4-byte big-endian length header.
+try:
+    import zstandard
+except ImportError:  # optional — only needed for the zstd codec
+    zstandard = None
 
-    Frame format: [4-byte BE uint32 compressed_length][gzip compressed data]
+CODECS = ("gzip", "zstd")
+
+# 4-byte big-endian length header in front of every compressed frame.
+FRAME_HEADER = struct.Struct("!I")
+
+# Set in a frame's length header when its body continues the connection's
+# compression stream instead of starting a new one.
+STREAM_CONTINUATION = 1 << 31
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# zstd (de)compressor objects are reusable but not safe to share between
+# threads, and the server decompresses on one thread per client.
+_zstd_local = threading.local()
+
+# wbits=31 has deflate write the gzip wrapper itself (zero mtime header,
+# CRC32 computed during compression), skipping gzip.compress's Python-side
+# header building and second CRC pass over the data.
+_GZIP_WBITS = 31
+
+# Fastest deflate level. Log batches compress well even at 1, and the
+# shipper's CPU is the bottleneck long before the network is.
+DEFAULT_LEVEL = 1
+
+
+def _zstd_compressor(level: int):
+    """Return this thread's zstd compressor for *level*."""
+    compressors = getattr(_zstd_local, "compressors", None)
+    if compressors is None:
+        compressors = _zstd_local.compressors = {}
+    cctx = compressors.get(level)
+    if cctx is None:
+        cctx = compressors[level] = zstandard.ZstdCompressor(level=level)
+    return cctx
+
+
+def _zstd_decompressor():
+    """Return this thread's zstd decompressor."""
+    dctx = getattr(_zstd_local, "decompressor", None)
+    if dctx is None:
+        dctx = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return dctx
+
+
+def compress_frame_parts(
+    data: bytes, level: int = DEFAULT_LEVEL, codec: str = "gzip",
+) -> list[bytes]:
+    """Compress data and return [length header, compressed data].
+
+    The two parts are left unjoined so they can go straight to a
+    scatter-gather send without copying the compressed body.
+    *level* is a gzip level (0-9), capped to the backend's maximum, or a
+    zstd level when *codec* is "zstd".
+    """
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+        compressed = _zstd_compressor(level).compress(data)
+    else:
+        compressed = _zlib.compress(data, level=min(level, _MAX_LEVEL), wbits=_GZIP_WBITS)
+    return [FRAME_HEADER.pack(len(compressed)), compressed]
+
+
+def compress_payload(data: bytes, level: int = DEFAULT_LEVEL, codec: str = "gzip") -> bytes:
+    """Compress data and prepend a 4-byte big-endian length header.
+
+    Frame format: [4-byte BE uint32 compressed_length][gzip or zstd data]
+
+    Callers pass a whole batch of NDJSON lines so one stream covers it.
     """
-    compressed = gzip.compress(data)
-    header = struct.pack("!I", len(compressed))
-    return header + compressed
+    return b"".join(compress_frame_parts(data, level, codec))
 
 
 def decompress_frame(frame: bytes) -> bytes:
-    """Read 4-byte length header, extract and decompress the gzip payload."""
+    """Read 4-byte length header, extract and decompress the gzip or zstd payload."""
     if len(frame) < 4:
         raise ValueError("Frame too short: need at least 4 bytes for header")
 
-    length = struct.unpack("!I", frame[:4])[0]
+    (length,) = FRAME_HEADER.unpack_from(frame)
     compressed = frame[4:4 + length]
 
     if len(compressed) < length:
@@ -27,18 +103,119 @@ def decompress_frame(frame: bytes) -> bytes:
             f"Incomplete frame: expected {length} bytes, got {len(compressed)}"
         )
 
+    if compressed[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError("zstd frame received but zstandard is not installed")
+        return _zstd_decompressor().decompress(compressed)
     return gzip.decompress(compressed)
 
 
-def is_compressed(data: bytes) -> bool:
-    """Detect whether a payload is a compressed frame.
+class StreamCompressor:
+    """Compresses successive batches on one connection as a single stream.
+
+    Each batch is flushed to a byte boundary and framed on its own, but the
+    compressor keeps its window between batches, so later batches refer
+    back to the timestamps, levels and messages of earlier ones. Small
+    batches of log lines come out several times smaller than as independent
+    frames. The first frame after construction or reset() starts the stream
+    with a normal gzip or zstd header; the rest are flagged with
+    STREAM_CONTINUATION and only decode in order on the same connection.
+    """
+
+    def __init__(self, level: int = DEFAULT_LEVEL, codec: str = "gzip"):
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+        self._level = level
+        self._codec = codec
+        self._cobj = None
+
+    def reset(self):
+        """Start a new stream; call whenever the connection is replaced."""
+        self._cobj = None
+
+    def compress_frame_parts(self, data: bytes) -> list[bytes]:
+        """Compress data onto the stream and return [length header, body]."""
+        flag = STREAM_CONTINUATION
+        if self._cobj is None:
+            flag = 0
+            if self._codec == "zstd":
+                # A compression object holds its own context, so each
+                # stream needs its own compressor.
+                self._cobj = zstandard.ZstdCompressor(level=self._level).compressobj()
+            else:
+                self._cobj = _zlib.compressobj(
+                    level=min(self._level, _MAX_LEVEL), wbits=_GZIP_WBITS,
+                )
+        if self._codec == "zstd":
+            body = self._cobj.compress(data) + self._cobj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        else:
+            body = self._cobj.compress(data) + self._cobj.flush(_zlib.Z_SYNC_FLUSH)
+        return [FRAME_HEADER.pack(len(body) | flag), body]
+
+
+class StreamDecompressor:
+    """Decompresses the frames one connection receives, in order.
+
+    Frames from StreamCompressor continue the stream started by the last
+    frame without the STREAM_CONTINUATION flag. Independent frames from
+    compress_payload are simply streams of one frame.
+    """
+
+    def __init__(self):
+        self._dobj = None
+
+    @property
+    def active(self) -> bool:
+        """Whether a stream has started, so continuation frames can follow."""
+        return self._dobj is not None
+
+    def decompress_frame(self, frame: bytes) -> bytes:
+        """Decompress one length-prefixed frame; see decompress_frame()."""
+        if len(frame) < 4:
+            raise ValueError("Frame too short: need at least 4 bytes for header")
+
+        (header,) = FRAME_HEADER.unpack_from(frame)
+        length = header & ~STREAM_CONTINUATION
+        compressed = frame[4:4 + length]
+        if len(compressed) < length:
+            raise ValueError(
+                f"Incomplete frame: expected {length} bytes, got {len(compressed)}"
+            )
+
+        if not header & STREAM_CONTINUATION:
+            if compressed[:4] == _ZSTD_MAGIC:
+                if zstandard is None:
+                    raise ValueError("zstd frame received but zstandard is not installed")
+                self._dobj = zstandard.ZstdDecompressor().decompressobj()
+            else:
+                self._dobj = zlib.decompressobj(wbits=_GZIP_WBITS)
+        elif self._dobj is None:
+            raise ValueError("Continuation frame without a stream to continue")
+        try:
+            return self._dobj.decompress(compressed)
+        except Exception:
+            # The stream is broken; later continuation frames can't decode
+            self._dobj = None
+            raise
+
+
+def is_compressed(data: bytes, offset: int = 0) -> bool:
+    """Detect whether the payload at *offset* in *data* is a compressed frame.
 
-    Compressed frames have a 4-byte BE length header followed by gzip data.
-    Gzip data starts with magic bytes 0x1f 0x8b. We check for these after
-    the length header. Plain NDJSON starts with '{' (0x7B).
+    Compressed frames have a 4-byte BE length header followed by gzip or
+    zstd data. Gzip data starts with magic bytes 0x1f 0x8b, zstd data with
+    0x28 0xb5. We check for these after the length header. Plain NDJSON
+    starts with '{' (0x7B), which is tested first since it is the common case.
     """
-    if len(data) < 6:
-        # Need at least 4-byte header + 2-byte gzip magic
-        return data[0:1] != b"{" if data else False
-    # Check gzip magic bytes at offset 4 (after length header)
-    return data[4] == 0x1F and data[5] == 0x8B
+    available = len(data) - offset
+    if available <= 0:
+        return False
+    if data[offset] == 0x7B:  # '{'
+        return False
+    if available < 6:
+        # Need at least 4-byte header + 2-byte magic
+        return True
+    # Check gzip or zstd magic bytes at offset 4 (after length header)
+    b4 = data[offset + 4]
+    b5 = data[offset + 5]
+    return (b4 == 0x1F and b5 == 0x8B) or (b4 == 0x28 and b5 == 0xB5)
@@ -1,12 +1,20 @@
 """Configuration module — frozen dataclass loaded from env vars and CLI args."""
 
+import logging
 import os
 import sys
 from dataclasses import dataclass
 
+from src.compressor import CODECS
+
+logger = logging.getLogger(__name__)
+
+
+_TRUE_VALUES = frozenset({"true", "1", "yes"})
+
 
 def _parse_bool(value: str) -> bool:
-    return value.strip().lower() in ("true", "1", "yes")
+    return value.strip().lower() in _TRUE_VALUES
 
 
 @dataclass(frozen=True)
@@ -16,11 +24,48 @@ class Config:
     server_port: int = 9000
     batch_mode: bool = True
     compress: bool = False
+    compress_level: int = 1
+    compress_codec: str = "gzip"
     batch_size: int = 1
+    micro_batch: int = 128
     metrics_interval: int = 0
     poll_interval: float = 0.5
     buffer_size: int = 50000
     resilient: bool = False
+    parallelism: int = 1
+
+
+def _parse_mode(value: str) -> bool:
+    return value.lower() == "batch"
+
+
+def _parse_codec(value: str) -> str:
+    codec = value.strip().lower()
+    if codec not in CODECS:
+        raise ValueError(f"Unknown compression codec {value!r}, expected one of {CODECS}")
+    return codec
+
+
+# Config field -> parser for its string value. The env var for each field
+# is its upper-cased name; the CLI flag is --<name> with dashes or underscores.
+_COERCE = {
+    "log_file": str,
+    "server_host": str,
+    "server_port": int,
+    "compress": _parse_bool,
+    "compress_level": int,
+    "compress_codec": _parse_codec,
+    "batch_size": int,
+    "micro_batch": int,
+    "metrics_interval": int,
+    "poll_interval": float,
+    "buffer_size": int,
+    "resilient": _parse_bool,
+    "parallelism": int,
+}
+
+# Every key the CLI accepts, including the shipping-mode aliases.
+_CLI_KEYS = frozenset(_COERCE) | {"mode", "batch_mode"}
 
 
 def load_config(argv: list[str] | None = None) -> Config:
@@ -29,25 +74,13 @@ def load_config(argv: list[str] | None = None) -> Config:
         argv = sys.argv[1:]
 
     # Start with env var overrides on top of defaults
-    env_mode = os.environ.get("SHIPPING_MODE", "batch")
     kwargs: dict = {
-        "log_file": os.environ.get("LOG_FILE", Config.log_file),
-        "server_host": os.environ.get("SERVER_HOST", Config.server_host),
-        "server_port": int(os.environ.get("SERVER_PORT", str(Config.server_port))),
-        "batch_mode": env_mode.lower() == "batch",
-        "compress": _parse_bool(os.environ.get("COMPRESS", "false")),
-        "batch_size": int(os.environ.get("BATCH_SIZE", str(Config.batch_size))),
-        "metrics_interval": int(
-            os.environ.get("METRICS_INTERVAL", str(Config.metrics_interval))
-        ),
-        "poll_interval": float(
-            os.environ.get("POLL_INTERVAL", str(Config.poll_interval))
-        ),
-        "buffer_size": int(
-            os.environ.get("BUFFER_SIZE", str(Config.buffer_size))
-        ),
-        "resilient": _parse_bool(os.environ.get("RESILIENT", "false")),
+        "batch_mode": _parse_mode(os.environ.get("SHIPPING_MODE", "batch")),
     }
+    for key, coerce in _COERCE.items():
+        env_value = os.environ.get(key.upper())
+        if env_value is not None:
+            kwargs[key] = coerce(env_value)
 
     # CLI arg overrides (simple --key=value or --key value parsing)
     i = 0
@@ -67,24 +100,14 @@ def load_config(argv: list[str] | None = None) -> Config:
 
             key = key.replace("-", "_")
 
-            if key in ("server_host", "log_file"):
-                kwargs[key] = value
-            elif key == "server_port":
-                kwargs[key] = int(value)
-            elif key == "batch_mode":
-                kwargs[key] = value.lower() == "batch" or _parse_bool(value)
+            if key not in _CLI_KEYS:
+                logger.warning("Ignoring unknown config option --%s", key.replace("_", "-"))
             elif key == "mode":
-                kwargs["batch_mode"] = value.lower() == "batch"
-            elif key in ("compress", "resilient"):
-                kwargs[key] = _parse_bool(value)
-            elif key == "batch_size":
-                kwargs[key] = int(value)
-            elif key == "metrics_interval":
-                kwargs[key] = int(value)
-            elif key == "poll_interval":
-                kwargs[key] = float(value)
-            elif key == "buffer_size":
-                kwargs[key] = int(value)
+                kwargs["batch_mode"] = _parse_mode(value)
+            elif key == "batch_mode":
+                kwargs[key] = _parse_mode(value) or _parse_bool(value)
+            elif key in _COERCE:
+                kwargs[key] = _COERCE[key](value)
         i += 1
 
     return Config(**kwargs)
@@ -1,22 +1,94 @@
 """File reader with batch and continuous tailing modes."""
 
+import ctypes
 import logging
 import os
+import select
+import sys
 import threading
 import time
 
 logger = logging.getLogger(__name__)
 
+# Bytes requested per os.read() while tailing.
+READ_CHUNK_SIZE = 64 * 1024
+
+# inotify(7) constants from <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_DELETE_SELF | _IN_MOVE_SELF
+
 
 def read_batch(path: str) -> list[str]:
     """Read all non-empty stripped lines from a file."""
     with open(path, "r", encoding="utf-8") as f:
-        return [line.strip() for line in f if line.strip()]
+        return [stripped for line in f if (stripped := line.strip())]
+
+
+class _INotify:
+    """One Linux inotify instance through libc, watching a single path at a time."""
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._wd = -1
+
+    @property
+    def watching(self) -> bool:
+        return self._wd >= 0
+
+    def watch(self, path: str) -> None:
+        """Replace the current watch with one on *path*."""
+        if self._wd >= 0:
+            # Fails harmlessly if the kernel already dropped it (file deleted)
+            self._libc.inotify_rm_watch(self._fd, self._wd)
+            self._wd = -1
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+        self._wd = wd
+
+    def wait(self, timeout: float) -> None:
+        """Wait up to *timeout* seconds for an event, then drain all events."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if ready:
+            try:
+                while os.read(self._fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _open_inotify() -> _INotify | None:
+    """Return an inotify instance, or None where unsupported."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _INotify()
+    except (OSError, AttributeError):
+        return None
 
 
 class FileTailer:
     """Watches a log file for new lines and calls a callback for each one.
 
+    Reads the raw file descriptor in large chunks and splits lines on bytes,
+    holding back a trailing partial line until its newline arrives. The
+    optional on_read hook runs after each chunk's lines have been delivered.
+
+    On Linux, an idle tailer sleeps on an inotify watch (through libc, no
+    extra packages) and wakes as soon as the file is written; poll_interval
+    then only bounds how long a shutdown or missed event can go unnoticed.
+
     Handles:
     - File not yet existing (waits for creation)
     - Log rotation (inode change detection)
@@ -29,13 +101,17 @@ class FileTailer:
         shutdown_event: threading.Event,
         callback=None,
         poll_interval: float = 0.5,
+        on_read=None,
     ):
         self._path = path
         self._shutdown = shutdown_event
         self._callback = callback
         self._poll_interval = poll_interval
-        self._file = None
+        self._on_read = on_read
+        self._fd: int | None = None
         self._inode = None
+        self._pending = bytearray()
+        self._inotify: _INotify | None = None
 
     def run(self):
         """Main tailing loop — blocks until shutdown_event is set."""
@@ -43,6 +119,7 @@ class FileTailer:
         if self._shutdown.is_set():
             return
 
+        self._inotify = _open_inotify()
         self._open_file(seek_end=True)
 
         while not self._shutdown.is_set():
@@ -52,15 +129,48 @@ class FileTailer:
             if self._check_truncation():
                 continue
 
-            line = self._file.readline()
-            if line:
-                stripped = line.strip()
-                if stripped and self._callback:
-                    self._callback(stripped)
-            else:
-                self._shutdown.wait(self._poll_interval)
+            chunk = os.read(self._fd, READ_CHUNK_SIZE)
+            if not chunk:
+                self._wait_for_change()
+                continue
+            self._emit(chunk)
+            # A full block means more is waiting: keep reading without the
+            # rotation/truncation syscalls until the file is drained.
+            while len(chunk) == READ_CHUNK_SIZE and not self._shutdown.is_set():
+                chunk = os.read(self._fd, READ_CHUNK_SIZE)
+                self._emit(chunk)
 
         self._close_file()
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _wait_for_change(self):
+        """Sleep until the file changes, or at most poll_interval."""
+        if self._inotify is None or not self._inotify.watching:
+            self._shutdown.wait(self._poll_interval)
+            return
+        self._inotify.wait(self._poll_interval)
+
+    def _emit(self, chunk: bytes, final: bool = False):
+        """Buffer *chunk* and pass each complete, non-empty line to the callback.
+
+        With *final*, a trailing line without a newline is emitted too.
+        """
+        pending = self._pending
+        pending += chunk
+        end = len(pending) if final else pending.rfind(b"\n")
+        if end < 0:
+            return
+        complete = bytes(pending[:end])
+        del pending[:end + 1]
+        if self._callback:
+            for raw in complete.split(b"\n"):
+                stripped = raw.decode("utf-8", "replace").strip()
+                if stripped:
+                    self._callback(stripped)
+        if self._on_read:
+            self._on_read()
 
     def _wait_for_file(self):
         """Block until the file exists or shutdown is requested."""
@@ -72,17 +182,27 @@ class FileTailer:
 
     def _open_file(self, seek_end: bool = False):
         """Open the file and optionally seek to the end."""
-        self._file = open(self._path, "r", encoding="utf-8")
-        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._fd = os.open(self._path, os.O_RDONLY)
+        self._inode = os.fstat(self._fd).st_ino
         if seek_end:
-            self._file.seek(0, os.SEEK_END)
+            os.lseek(self._fd, 0, os.SEEK_END)
+        if self._inotify is not None:
+            self._watch_file()
         logger.debug("Opened %s (inode=%d)", self._path, self._inode)
 
+    def _watch_file(self):
+        """Point the inotify watch at the file now at the path."""
+        try:
+            self._inotify.watch(self._path)
+        except OSError as e:
+            logger.debug("Cannot watch %s, polling instead: %s", self._path, e)
+
     def _close_file(self):
-        """Close the current file handle."""
-        if self._file:
-            self._file.close()
-            self._file = None
+        """Close the current file descriptor."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._pending.clear()
 
     def _check_rotation(self) -> bool:
         """Detect log rotation by comparing inodes. Returns True if rotated."""
@@ -94,10 +214,9 @@ class FileTailer:
         if current_inode != self._inode:
             logger.info("File rotation detected for %s", self._path)
             # Read any remaining lines from old file
-            for line in self._file:
-                stripped = line.strip()
-                if stripped and self._callback:
-                    self._callback(stripped)
+            while chunk := os.read(self._fd, READ_CHUNK_SIZE):
+                self._emit(chunk)
+            self._emit(b"", final=True)
             self._close_file()
             self._open_file(seek_end=False)
             return True
@@ -105,14 +224,11 @@ class FileTailer:
 
     def _check_truncation(self) -> bool:
         """Detect file truncation (e.g., > file). Returns True if truncated."""
-        try:
-            file_size = os.path.getsize(self._path)
-        except FileNotFoundError:
-            return False
-
-        current_pos = self._file.tell()
+        file_size = os.fstat(self._fd).st_size
+        current_pos = os.lseek(self._fd, 0, os.SEEK_CUR)
         if current_pos > file_size:
             logger.info("File truncation detected for %s", self._path)
-            self._file.seek(0)
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            self._pending.clear()
             return True
         return False
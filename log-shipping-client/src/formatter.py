@@ -1,25 +1,49 @@
 """Parse raw log lines into structured NDJSON messages."""
 
 import json
+import sys
+from json.encoder import encode_basestring as _quote
 
+try:
+    import orjson
+except ImportError:  # optional — faster JSON encoding
+    orjson = None
 
-def parse_log_line(line: str) -> dict | None:
-    """Parse a log line in 'YYYY-MM-DD HH:MM:SS LEVEL Message' format.
+# json.dumps builds a new JSONEncoder on every call with non-default
+# options; keep one for the stdlib fallback.
+_encode_json = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
 
-    Returns a dict with timestamp, level, message keys, or None if unparseable.
-    """
+# Raw level token -> interned upper-case level. Bounded, since the level
+# slot of a malformed line can hold any word.
+_LEVEL_CACHE: dict[str, str] = {}
+_LEVEL_CACHE_MAX = 64
+
+
+def _canonical_level(level: str) -> str:
+    """Return the shared, upper-cased str for *level*."""
+    canonical = _LEVEL_CACHE.get(level)
+    if canonical is None:
+        canonical = sys.intern(level.upper())
+        if len(_LEVEL_CACHE) < _LEVEL_CACHE_MAX:
+            _LEVEL_CACHE[level] = canonical
+    return canonical
+
+
+def _split_log_line(line: str) -> tuple[str, str, str] | None:
+    """Split a log line into (timestamp, LEVEL, message), or None if unparseable."""
     stripped = line.strip()
     if not stripped:
         return None
 
     # Expected format: "2024-01-15 08:23:45 INFO Application started"
     # Date(10) + space(1) + Time(8) + space(1) + LEVEL + space + message
+    # A single str.split plus a few containment checks measures faster than
+    # an equivalent compiled regex, so keep this as the parser's hot path.
     parts = stripped.split(None, 3)
     if len(parts) < 4:
         return None
 
     date_str, time_str, level, message = parts
-    timestamp = f"{date_str} {time_str}"
 
     # Basic validation: timestamp should have a dash, level should be alphabetic
     if "-" not in date_str or ":" not in time_str:
@@ -27,13 +51,51 @@ def parse_log_line(line: str) -> dict | None:
     if not level.isalpha():
         return None
 
+    return f"{date_str} {time_str}", _canonical_level(level), message
+
+
+def parse_log_line(line: str) -> dict | None:
+    """Parse a log line in 'YYYY-MM-DD HH:MM:SS LEVEL Message' format.
+
+    Returns a dict with timestamp, level, message keys, or None if unparseable.
+    """
+    fields = _split_log_line(line)
+    if fields is None:
+        return None
+
+    timestamp, level, message = fields
     return {
         "timestamp": timestamp,
-        "level": level.upper(),
+        "level": level,
         "message": message,
     }
 
 
 def format_ndjson(entry: dict) -> bytes:
-    """Serialize a dict to compact JSON + newline, encoded as UTF-8."""
-    return (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+    """Serialize a dict to compact JSON + newline, encoded as UTF-8.
+
+    Non-ASCII text is emitted as raw UTF-8 (not \\u escapes), matching orjson.
+    """
+    if orjson is not None:
+        # Let orjson write the newline rather than copying its output to add one
+        return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+    return (_encode_json(entry) + "\n").encode("utf-8")
+
+
+def parse_and_format(line: str) -> bytes | None:
+    """parse_log_line + format_ndjson in one step, without the intermediate dict.
+
+    The schema is fixed, so the JSON is assembled directly from the fields
+    with json's C string escaper. Output is byte-for-byte what
+    format_ndjson(parse_log_line(line)) gives.
+    """
+    fields = _split_log_line(line)
+    if fields is None:
+        return None
+
+    timestamp, level, message = fields
+    # The level is alphabetic, so it never needs escaping
+    return (
+        '{"timestamp":%s,"level":"%s","message":%s}\n'
+        % (_quote(timestamp), level, _quote(message))
+    ).encode("utf-8")
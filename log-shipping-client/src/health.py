@@ -4,6 +4,8 @@ import logging
 import socket
 import threading
 
+from src.tcp_client import TCPClient
+
 logger = logging.getLogger(__name__)
 
 
@@ -11,7 +13,9 @@ class HealthMonitor:
     """Periodically probes a TCP endpoint and tracks health state.
 
     Uses a simple TCP connect probe — if the connection succeeds,
-    the server is healthy. Logs state transitions only.
+    the server is healthy. When given the shipper's *client*, a live
+    connection already proves health, so the connect probe only runs while
+    that client is disconnected. Logs state transitions only.
     """
 
     def __init__(
@@ -20,11 +24,13 @@ class HealthMonitor:
         port: int,
         shutdown_event: threading.Event,
         interval: float = 10.0,
+        client: TCPClient | None = None,
     ):
         self._host = host
         self._port = port
         self._shutdown = shutdown_event
         self._interval = interval
+        self._client = client
         self._healthy = threading.Event()
         self._thread: threading.Thread | None = None
 
@@ -73,7 +79,9 @@ class HealthMonitor:
             self._shutdown.wait(self._interval)
 
     def _probe(self) -> bool:
-        """Attempt a TCP connect to check server availability."""
+        """Check server availability, reusing the client's connection if up."""
+        if self._client is not None and self._client.connected:
+            return True
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(2.0)
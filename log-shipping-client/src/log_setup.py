@@ -0,0 +1,33 @@
+"""Logging setup — records are queued and written to stderr off-thread."""
+
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s — %(message)s"
+
+
+def configure_logging(level: int = logging.INFO) -> QueueListener:
+    """Install a QueueHandler on the root logger and start its listener.
+
+    Logging from the shipper threads then only enqueues the record; a
+    background thread formats it and writes to stderr. Call stop() on the
+    returned listener before exit to flush pending records.
+    """
+    # LOG_FORMAT uses none of these, so skip collecting them per record.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None  # no caller frame lookup (no %(filename)s etc.)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = QueueListener(log_queue, stream_handler)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+    listener.start()
+    return listener
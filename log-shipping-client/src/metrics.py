@@ -6,57 +6,75 @@ import threading
 
 logger = logging.getLogger(__name__)
 
+# One reporter line, formatted straight to bytes.
+_REPORT_TEMPLATE = (
+    b"[metrics] sent=%d failed=%d avg_latency=%.1fms max_latency=%.1fms avg_buffer=%.0f\n"
+)
+
 
 class Metrics:
-    """Thread-safe counters for tracking shipper performance."""
+    """Thread-safe counters for tracking shipper performance.
+
+    Latency and buffer samples are kept as running sums and maxima, so
+    recording is O(1) and memory stays flat between snapshots. Latencies
+    are summed as integer nanoseconds and only converted to milliseconds
+    in the snapshot, so the sum collects no float rounding error.
+    """
 
     def __init__(self):
         self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
         self._sent = 0
         self._failed = 0
-        self._latencies: list[float] = []
-        self._buffer_samples: list[int] = []
+        self._latency_sum_ns = 0
+        self._latency_max_ns = 0
+        self._buffer_sum = 0
+        self._buffer_count = 0
+
+    def record_sent(self, latency_ms: float, count: int = 1):
+        """Record *count* successful sends, each with latency in milliseconds."""
+        self.record_sent_ns(round(latency_ms * 1_000_000), count)
 
-    def record_sent(self, latency_ms: float):
-        """Record a successful send with its latency in milliseconds."""
+    def record_sent_ns(self, latency_ns: int, count: int = 1):
+        """Record *count* successful sends, each with latency in nanoseconds.
+
+        Takes time.monotonic_ns() differences as they are.
+        """
         with self._lock:
-            self._sent += 1
-            self._latencies.append(latency_ms)
+            self._sent += count
+            self._latency_sum_ns += latency_ns * count
+            if latency_ns > self._latency_max_ns:
+                self._latency_max_ns = latency_ns
 
-    def record_failed(self):
-        """Record a failed send."""
+    def record_failed(self, count: int = 1):
+        """Record *count* failed sends."""
         with self._lock:
-            self._failed += 1
+            self._failed += count
 
     def record_buffer_usage(self, size: int):
         """Record a buffer queue size sample."""
         with self._lock:
-            self._buffer_samples.append(size)
+            self._buffer_sum += size
+            self._buffer_count += 1
 
     def snapshot_and_reset(self) -> dict:
         """Atomically read all counters and reset them to zero."""
         with self._lock:
-            latencies = self._latencies
-            buffer_samples = self._buffer_samples
-
+            sent = self._sent
             snapshot = {
-                "sent": self._sent,
+                "sent": sent,
                 "failed": self._failed,
-                "avg_latency_ms": (
-                    sum(latencies) / len(latencies) if latencies else 0.0
-                ),
-                "max_latency_ms": max(latencies) if latencies else 0.0,
+                "avg_latency_ms": self._latency_sum_ns / sent / 1e6 if sent else 0.0,
+                "max_latency_ms": self._latency_max_ns / 1e6,
                 "avg_buffer_usage": (
-                    sum(buffer_samples) / len(buffer_samples)
-                    if buffer_samples
+                    self._buffer_sum / self._buffer_count
+                    if self._buffer_count
                     else 0.0
                 ),
             }
-
-            self._sent = 0
-            self._failed = 0
-            self._latencies = []
-            self._buffer_samples = []
+            self._reset()
 
             return snapshot
 
@@ -93,12 +111,21 @@ class MetricsReporter:
                 break
 
             snapshot = self._metrics.snapshot_and_reset()
-            print(
-                f"[metrics] sent={snapshot['sent']} "
-                f"failed={snapshot['failed']} "
-                f"avg_latency={snapshot['avg_latency_ms']:.1f}ms "
-                f"max_latency={snapshot['max_latency_ms']:.1f}ms "
-                f"avg_buffer={snapshot['avg_buffer_usage']:.0f}",
-                file=sys.stderr,
-                flush=True,
+            report = _REPORT_TEMPLATE % (
+                snapshot["sent"],
+                snapshot["failed"],
+                snapshot["avg_latency_ms"],
+                snapshot["max_latency_ms"],
+                snapshot["avg_buffer_usage"],
             )
+            stream = sys.stderr
+            # Write the bytes under the text layer when there is one, so
+            # the line isn't decoded and re-encoded on its way out.
+            out = getattr(stream, "buffer", None)
+            if out is None:
+                stream.write(report.decode())
+                stream.flush()
+            else:
+                stream.flush()
+                out.write(report)
+                out.flush()
@@ -1,40 +1,80 @@
 """Resilient log shipper with buffering, retry, and reconnect."""
 
+import itertools
 import logging
 import queue
 import threading
 import time
+from collections import deque
 
-from src.compressor import compress_payload
+from src.compressor import StreamCompressor
 from src.config import Config
 from src.file_reader import read_batch, FileTailer
-from src.formatter import parse_log_line, format_ndjson
+from src.formatter import parse_and_format
 from src.health import HealthMonitor
 from src.metrics import Metrics
 from src.tcp_client import TCPClient
 
 logger = logging.getLogger(__name__)
 
+# Stop coalescing queued lines into one send once the payload reaches this
+# size, so a large batch_size cannot build an unbounded frame.
+MAX_BATCH_BYTES = 1 << 20
+
+# Hand the producer's local chunk to the consumer once it holds this many
+# bytes, even if it has fewer than config.micro_batch lines.
+MICRO_BATCH_BYTES = 64 * 1024
+
+# Seconds between buffer-usage samples for the metrics.
+BUFFER_SAMPLE_INTERVAL = 1.0
+
 
 class ResilientLogShipper:
     """Producer-consumer shipper that decouples file reading from network I/O.
 
     Producer thread reads file -> parses -> enqueues formatted NDJSON bytes.
     Consumer thread dequeues -> sends with retry -> auto-reconnects.
+
+    There is exactly one producer and one consumer, so the buffer is a
+    plain deque (append/popleft are atomic) plus an Event to wake the
+    consumer, rather than a lock-and-condition queue.Queue. The producer
+    collects payloads into a local list and enqueues it as one item every
+    config.micro_batch lines, so the hand-off happens per chunk, not per line.
     """
 
     def __init__(self, config: Config, shutdown_event: threading.Event):
         self._config = config
         self._shutdown = shutdown_event
-        self._client = TCPClient(config.server_host, config.server_port, shutdown_event)
-        self._queue: queue.Queue = queue.Queue(maxsize=config.buffer_size)
+        self._clients = [
+            TCPClient(config.server_host, config.server_port, shutdown_event)
+            for _ in range(max(config.parallelism, 1))
+        ]
+        self._client = self._clients[0]
+        # Each connection carries its own compression stream, restarted on
+        # every reconnect since the server starts over with the connection.
+        self._streams = [
+            StreamCompressor(config.compress_level, config.compress_codec)
+            for _ in self._clients
+        ] if config.compress else None
+        self._buffer: deque[list[bytes] | None] = deque()
+        self._wake = threading.Event()
+        self._local_batch: list[bytes] = []
+        self._local_batch_bytes = 0
+        # Lines handed to / taken from the buffer. Each counter has a single
+        # writer, so their difference is the buffered line count, lock-free.
+        self._enqueued = 0
+        self._dequeued = 0
         self._health = HealthMonitor(
             config.server_host, config.server_port, shutdown_event, interval=5.0,
+            client=self._client,
         )
         self._metrics = Metrics()
-        self._sent = 0
-        self._failed = 0
-        self._lock = threading.Lock()
+        # Per-sender counters plus the producer's drop count. Every slot has
+        # a single writer, so no lock is needed; reads are eventually
+        # consistent, which is all the totals are used for.
+        self._sent = [0] * len(self._clients)
+        self._failed = [0] * len(self._clients)
+        self._dropped = 0
 
     @property
     def metrics(self) -> Metrics:
@@ -42,19 +82,20 @@ class ResilientLogShipper:
 
     @property
     def sent(self) -> int:
-        with self._lock:
-            return self._sent
+        return sum(self._sent)
 
     @property
     def failed(self) -> int:
-        with self._lock:
-            return self._failed
+        return sum(self._failed) + self._dropped
 
     def run(self):
-        """Start health monitor and consumer thread, then produce messages."""
+        """Start health monitor, consumer and sampler threads, then produce messages."""
         self._health.start()
         consumer = threading.Thread(target=self._consumer_loop, daemon=True)
         consumer.start()
+        finished = threading.Event()
+        sampler = threading.Thread(target=self._sample_buffer, args=(finished,), daemon=True)
+        sampler.start()
 
         try:
             if self._config.batch_mode:
@@ -63,22 +104,33 @@ class ResilientLogShipper:
                 self._produce_continuous()
         finally:
             # Send poison pill to signal consumer to stop
-            self._queue.put(None)
+            self._buffer.append(None)
+            self._wake.set()
             consumer.join(timeout=10)
-            self._client.close()
+            finished.set()
+            for client in self._clients:
+                client.close()
             self._health.stop()
             logger.info(
                 "Resilient shipper finished: sent=%d, failed=%d",
-                self._sent, self._failed,
+                self.sent, self.failed,
             )
 
+    def _sample_buffer(self, finished: threading.Event):
+        """Record the buffered line count once per interval until *finished*."""
+        while not finished.wait(BUFFER_SAMPLE_INTERVAL):
+            self._metrics.record_buffer_usage(self._enqueued - self._dequeued)
+
     def _produce_batch(self):
         """Read all lines and enqueue them."""
         lines = read_batch(self._config.log_file)
-        for line in lines:
-            if self._shutdown.is_set():
-                break
-            self._enqueue_line(line)
+        try:
+            for line in lines:
+                if self._shutdown.is_set():
+                    break
+                self._enqueue_line(line)
+        finally:
+            self._flush_local_batch()
 
     def _produce_continuous(self):
         """Tail the file and enqueue new lines."""
@@ -87,112 +139,184 @@ class ResilientLogShipper:
             self._shutdown,
             callback=self._enqueue_line,
             poll_interval=self._config.poll_interval,
+            on_read=self._flush_local_batch,
         )
-        tailer.run()
+        try:
+            tailer.run()
+        finally:
+            self._flush_local_batch()
 
     def _enqueue_line(self, raw: str):
-        """Parse and enqueue a single log line (uncompressed)."""
-        entry = parse_log_line(raw)
-        if entry is None:
+        """Parse a single log line (uncompressed) into the producer's chunk."""
+        payload = parse_and_format(raw)
+        if payload is None:
             return
 
-        payload = format_ndjson(entry)
-        try:
-            self._queue.put_nowait(payload)
-        except queue.Full:
-            with self._lock:
-                self._failed += 1
-            logger.warning("Buffer full, dropping log line")
+        self._local_batch.append(payload)
+        self._local_batch_bytes += len(payload)
+        if (len(self._local_batch) >= self._config.micro_batch
+                or self._local_batch_bytes >= MICRO_BATCH_BYTES):
+            self._flush_local_batch()
+
+    def _flush_local_batch(self):
+        """Enqueue the producer's chunk, dropping lines beyond buffer_size."""
+        chunk = self._local_batch
+        if not chunk:
+            return
+        self._local_batch = []
+        self._local_batch_bytes = 0
+
+        room = self._config.buffer_size - (self._enqueued - self._dequeued)
+        if room < len(chunk):
+            dropped = len(chunk) - max(room, 0)
+            self._dropped += dropped
+            logger.warning("Buffer full, dropping %d log line(s)", dropped)
+            if room <= 0:
+                return
+            chunk = chunk[:room]
+        self._enqueued += len(chunk)
+        self._buffer.append(chunk)
+        self._wake.set()
+
+    def _take(self, pending: list[bytes], limit: int) -> bool:
+        """Move queued chunks into *pending* until it holds *limit* lines.
+
+        Returns True once the poison pill has been reached.
+        """
+        buffer = self._buffer
+        while len(pending) < limit:
+            try:
+                chunk = buffer.popleft()
+            except IndexError:
+                return False
+            if chunk is None:
+                return True
+            pending.extend(chunk)
+            self._dequeued += len(chunk)
+        return False
+
+    def _batch_len(self, pending: list[bytes]) -> int:
+        """Number of leading *pending* payloads to send as one batch."""
+        limit = min(self._config.batch_size, len(pending))
+        size = 0
+        for i in range(limit):
+            size += len(pending[i])
+            if size >= MAX_BATCH_BYTES:
+                return i + 1
+        return limit
 
     def _consumer_loop(self):
-        """Dequeue messages in batches and send them with retry."""
+        """Dequeue messages in batches and send them with retry.
+
+        With config.parallelism > 1, batches go round-robin to one sender
+        thread per connection, so waiting for acks on one connection
+        overlaps with sends on the others. Lines may then arrive out of order.
+        """
+        if len(self._clients) == 1:
+            self._dispatch(self._send_batch_with_retry)
+            return
+
+        # A short queue per sender keeps backpressure on the shared buffer
+        queues = [queue.Queue(maxsize=2) for _ in self._clients]
+        senders = [
+            threading.Thread(target=self._sender_loop, args=(q, slot), daemon=True)
+            for slot, q in enumerate(queues)
+        ]
+        for sender in senders:
+            sender.start()
+        turn = itertools.cycle(queues)
+        try:
+            self._dispatch(
+                lambda batch, max_retries=3: next(turn).put((batch, max_retries))
+            )
+        finally:
+            for q in queues:
+                q.put(None)
+            for sender in senders:
+                sender.join()
+
+    def _sender_loop(self, batches: queue.Queue, slot: int):
+        """Send batches from *batches* over client *slot* until a None arrives."""
+        while (item := batches.get()) is not None:
+            batch, max_retries = item
+            self._send_batch_with_retry(batch, max_retries, slot)
+
+    def _dispatch(self, send):
+        """Carve the buffer into batches and pass each to *send*."""
+        pending: list[bytes] = []
         while not self._shutdown.is_set():
-            try:
-                first = self._queue.get(timeout=1.0)
-            except queue.Empty:
+            # Clear before checking, so an append racing with the check
+            # still leaves the event set and the wait returns at once.
+            self._wake.clear()
+            if not pending and not self._buffer:
+                # No timeout needed: run() always ends production with a
+                # None pill and a wake, including on shutdown.
+                self._wake.wait()
                 continue
 
-            if first is None:
-                self._drain_queue()
+            # Coalesce whatever else is already queued into the same send,
+            # so a burst costs one syscall (and one gzip frame) per batch.
+            done = self._take(pending, self._config.batch_size)
+            if pending:
+                n = self._batch_len(pending)
+                send(pending[:n])
+                del pending[:n]
+            if done:
+                self._drain_queue(pending, send)
                 return
 
-            batch = [first]
-            while len(batch) < self._config.batch_size:
-                try:
-                    item = self._queue.get_nowait()
-                except queue.Empty:
-                    break
-                if item is None:
-                    self._send_batch_with_retry(batch)
-                    self._drain_queue()
-                    return
-                batch.append(item)
-
-            self._send_batch_with_retry(batch)
-
-    def _drain_queue(self):
-        """Send any remaining queued messages before shutdown."""
-        batch: list[bytes] = []
-        while True:
-            try:
-                payload = self._queue.get_nowait()
-            except queue.Empty:
-                break
-            if payload is None:
-                break
-            batch.append(payload)
-            if len(batch) >= self._config.batch_size:
-                self._send_batch_with_retry(batch, max_retries=1)
-                batch = []
-        if batch:
-            self._send_batch_with_retry(batch, max_retries=1)
-
-    def _send_batch_with_retry(self, batch: list[bytes], max_retries: int = 3):
-        """Send a batch of payloads, retrying with reconnect on failure."""
-        payload = b"".join(batch)
-        if self._config.compress:
-            payload = compress_payload(payload)
+    def _drain_queue(self, pending: list[bytes], send):
+        """Send *pending* and any remaining queued messages before shutdown."""
+        self._take(pending, float("inf"))
+        while pending:
+            n = self._batch_len(pending)
+            send(pending[:n], max_retries=1)
+            del pending[:n]
+
+    def _send_batch_with_retry(
+        self, batch: list[bytes], max_retries: int = 3, slot: int = 0,
+    ):
+        """Send a batch over client *slot*, retrying with reconnect on failure."""
+        client = self._clients[slot]
+        stream = self._streams[slot] if self._streams else None
+        payload = b"".join(batch) if stream else None
 
         for attempt in range(max_retries):
             if self._shutdown.is_set():
-                with self._lock:
-                    self._failed += len(batch)
+                self._failed[slot] += len(batch)
                 return
 
-            if not self._client.connected:
+            if not client.connected:
                 if not self._health.is_healthy:
                     logger.debug("Server unhealthy, waiting before reconnect")
                     self._health.wait_for_healthy(timeout=5.0)
-                if not self._client.connect_with_backoff(max_attempts=3):
+                if not client.connect_with_backoff(max_attempts=3):
                     continue
+                if stream:
+                    stream.reset()
 
-            self._metrics.record_buffer_usage(self._queue.qsize())
-
-            t0 = time.monotonic()
-            if not self._client.send(payload):
+            t0 = time.monotonic_ns()
+            # Compressed per attempt: a resend goes out on a new stream
+            parts = stream.compress_frame_parts(payload) if stream else batch
+            if not client.send_parts(parts):
                 continue
 
-            acked = 0
-            for _ in range(len(batch)):
-                result = self._client.recv_line()
-                if result and result.get("status") == "ok":
-                    acked += 1
-                else:
-                    break
+            acked = client.recv_acks(len(batch))
+            if not acked and not client.connected:
+                # Nothing was acked before the connection dropped: resend the
+                # batch on a fresh connection instead of counting it lost.
+                continue
 
-            latency_ms = (time.monotonic() - t0) * 1000
-            for _ in range(acked):
-                self._metrics.record_sent(latency_ms / max(acked, 1))
-            for _ in range(len(batch) - acked):
-                self._metrics.record_failed()
+            if acked:
+                latency_ns = time.monotonic_ns() - t0
+                self._metrics.record_sent_ns(latency_ns // acked, count=acked)
+            if len(batch) > acked:
+                self._metrics.record_failed(count=len(batch) - acked)
 
-            with self._lock:
-                self._sent += acked
-                self._failed += len(batch) - acked
+            self._sent[slot] += acked
+            self._failed[slot] += len(batch) - acked
             return
 
-        for _ in range(len(batch)):
-            self._metrics.record_failed()
-        with self._lock:
-            self._failed += len(batch)
+        self._metrics.record_failed(count=len(batch))
+        self._failed[slot] += len(batch)
         logger.warning("Failed to send batch of %d after %d retries", len(batch), max_retries)
@@ -2,18 +2,59 @@
 
 import json
 import logging
+import selectors
 import socket
-import struct
 import threading
 
-from src.compressor import decompress_frame, is_compressed
+from src.compressor import (
+    FRAME_HEADER, STREAM_CONTINUATION, StreamDecompressor, is_compressed,
+)
+from src.tcp_client import set_buffer_sizes, set_low_latency
+
+try:
+    import orjson
+except ImportError:  # optional — faster JSON parsing and encoding
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Bytes requested per recv() from a client connection.
+RECV_SIZE = 64 * 1024
+
+# Queued reply bytes past which the server stops reading from a client
+# until that client reads its acks.
+MAX_PENDING_REPLY_BYTES = 1 << 20
+
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _encode_response(resp: dict) -> bytes:
+        return orjson.dumps(resp, option=orjson.OPT_APPEND_NEWLINE)
+else:
+    _loads = json.loads
+
+    def _encode_response(resp: dict) -> bytes:
+        return json.dumps(resp).encode() + b"\n"
+
+
+# Encoded "ok" acks by line count. Clients send batches of a steady size,
+# so a few entries cover nearly every ack.
+_OK_ACKS: dict[int, bytes] = {}
+_OK_ACKS_MAX = 256
+
+# Selector key data marking the listening socket and the shutdown wakeup
+# socket; client connections carry their state dict instead.
+_LISTENER = "listener"
+_WAKEUP = "wakeup"
+
 
 class SimpleLogServer:
     """TCP server that receives NDJSON log messages and sends acks.
 
+    A single thread serves all clients through a selector (epoll on Linux),
+    keeping a receive buffer and a queue of unsent replies per connection;
+    no socket operation blocks.
+
     Stores received messages in self.received for test assertions.
     """
 
@@ -22,127 +63,268 @@ class SimpleLogServer:
         self._port = port
         self._shutdown = shutdown_event
         self._sock: socket.socket | None = None
+        self._sel: selectors.BaseSelector | None = None
         self._server_address: tuple | None = None
+        # Only the selector thread appends, and list.append is atomic, so
+        # readers on other threads need no lock.
         self.received: list[dict] = []
-        self._lock = threading.Lock()
+        # stop() writes a byte here to wake the selector, so the loop can
+        # block without a timeout and still exit at once.
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
 
     @property
     def server_address(self) -> tuple:
         return self._server_address
 
     def start(self):
-        """Bind, listen, and accept connections until shutdown."""
+        """Bind, listen, and serve every connection from one selector loop."""
         self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self._sock.settimeout(1.0)
+        self._sock.setblocking(False)
+        # Accepted connections inherit the listener's buffer sizes
+        set_buffer_sizes(self._sock)
         self._sock.bind((self._host, self._port))
         self._sock.listen(5)
         self._server_address = self._sock.getsockname()
         logger.info("Server listening on %s:%d", *self._server_address)
 
-        while not self._shutdown.is_set():
-            try:
-                conn, addr = self._sock.accept()
-            except socket.timeout:
-                continue
-            except OSError:
-                break
-
-            t = threading.Thread(
-                target=self._handle_client,
-                args=(conn, addr),
-                daemon=True,
-            )
-            t.start()
+        sel = self._sel = selectors.DefaultSelector()
+        sel.register(self._sock, selectors.EVENT_READ, data=_LISTENER)
+        sel.register(self._wakeup_r, selectors.EVENT_READ, data=_WAKEUP)
+        # One receive buffer shared by all connections; each read is copied
+        # straight into that connection's own bytearray.
+        recv_view = memoryview(bytearray(RECV_SIZE))
+        try:
+            while not self._shutdown.is_set():
+                for key, mask in sel.select():
+                    if key.data is _WAKEUP:
+                        return
+                    if key.data is _LISTENER:
+                        if not self._accept():
+                            return
+                        continue
+                    if mask & selectors.EVENT_WRITE and not self._flush(key.fileobj, key.data):
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        self._service(key.fileobj, key.data, recv_view)
+        finally:
+            for key in list(sel.get_map().values()):
+                if isinstance(key.data, dict):
+                    self._close_client(key.fileobj, key.data)
+            sel.close()
+            self._wakeup_r.close()
+            self._wakeup_w.close()
 
     def stop(self):
-        """Signal shutdown and close the listen socket."""
+        """Signal shutdown, wake the selector loop and close the listen socket."""
         self._shutdown.set()
+        try:
+            self._wakeup_w.send(b"\0")
+        except OSError:
+            pass
         if self._sock:
             try:
                 self._sock.close()
             except OSError:
                 pass
 
-    def _handle_client(self, conn: socket.socket, addr: tuple):
-        """Handle a single client connection: auto-detect plain or compressed."""
+    def _accept(self) -> bool:
+        """Accept a pending connection. Returns False if the listener is gone."""
+        try:
+            conn, addr = self._sock.accept()
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
         logger.info("Client connected from %s:%d", *addr)
-        buf = b""
-        conn.settimeout(1.0)
+        conn.setblocking(False)
+        set_low_latency(conn)
+        state = {
+            "addr": addr, "buf": bytearray(), "scan": 0, "out": bytearray(),
+            "stream": StreamDecompressor(),
+        }
+        self._sel.register(conn, selectors.EVENT_READ, data=state)
+        return True
+
+    def _service(self, conn: socket.socket, state: dict, recv_view: memoryview):
+        """Read what a readable client sent and process complete messages.
 
+        Auto-detects plain NDJSON or compressed frames.
+        """
         try:
-            while not self._shutdown.is_set():
-                try:
-                    data = conn.recv(4096)
-                except socket.timeout:
-                    continue
-                except OSError:
-                    break
-                if not data:
-                    break
+            n = conn.recv_into(recv_view)
+        except BlockingIOError:
+            return
+        except OSError:
+            n = 0
+        if not n:
+            self._close_client(conn, state)
+            return
 
-                buf += data
-                buf = self._process_buffer(conn, buf)
-        finally:
-            conn.close()
-            logger.info("Client disconnected: %s:%d", *addr)
+        buf = state["buf"]
+        buf += recv_view[:n]
+        state["scan"] = self._process_buffer(conn, buf, state["scan"], state["stream"])
+
+    def _reply(self, conn: socket.socket, data: bytes):
+        """Write *data* to *conn* without blocking the loop.
+
+        Whatever the socket doesn't take now is queued and flushed when the
+        selector reports it writable. Reading from a client that has let
+        too much pile up is paused until its queue drains.
+        """
+        state = self._sel.get_key(conn).data
+        out = state["out"]
+        if not out:
+            try:
+                sent = conn.send(data)
+            except BlockingIOError:
+                sent = 0
+            except OSError:
+                return  # the next read sees the broken connection
+            if sent == len(data):
+                return
+            data = memoryview(data)[sent:]
+        out += data
+        events = selectors.EVENT_WRITE
+        if len(out) < MAX_PENDING_REPLY_BYTES:
+            events |= selectors.EVENT_READ
+        self._sel.modify(conn, events, state)
+
+    def _flush(self, conn: socket.socket, state: dict) -> bool:
+        """Send queued replies. Returns False if the client was closed."""
+        out = state["out"]
+        try:
+            sent = conn.send(out)
+        except BlockingIOError:
+            return True
+        except OSError:
+            self._close_client(conn, state)
+            return False
+        del out[:sent]
+        if not out:
+            self._sel.modify(conn, selectors.EVENT_READ, state)
+        elif len(out) < MAX_PENDING_REPLY_BYTES:
+            self._sel.modify(conn, selectors.EVENT_READ | selectors.EVENT_WRITE, state)
+        return True
+
+    def _close_client(self, conn: socket.socket, state: dict):
+        """Unregister and close a client connection."""
+        self._sel.unregister(conn)
+        conn.close()
+        logger.info("Client disconnected: %s:%d", *state["addr"])
 
-    def _process_buffer(self, conn: socket.socket, buf: bytes) -> bytes:
-        """Process buffer, auto-detecting plain NDJSON vs compressed frames."""
-        while buf:
-            if not is_compressed(buf):
+    def _process_buffer(
+        self,
+        conn: socket.socket,
+        buf: bytearray,
+        scan_pos: int = 0,
+        stream: StreamDecompressor | None = None,
+    ) -> int:
+        """Process buffer, auto-detecting plain NDJSON vs compressed frames.
+
+        Consumed bytes are deleted from *buf* in place. *scan_pos* is the
+        offset already known to hold no newline, so each search only covers
+        newly received bytes; the updated offset is returned. *stream* is
+        the connection's decompressor, which carries a client's compression
+        stream from one frame to the next.
+
+        Acks are cumulative: one response per compressed frame, and one for
+        each run of plain lines found in the buffer, carrying the count.
+        """
+        if stream is None:
+            stream = StreamDecompressor()
+        pos = 0
+        ok = errors = 0
+        reason = None
+        while pos < len(buf):
+            # Continuation frames carry no magic bytes, only the header flag;
+            # a JSON line never starts with a byte that has the top bit set.
+            if not is_compressed(buf, pos) and not (stream.active and buf[pos] & 0x80):
                 # Plain NDJSON mode: process complete lines
-                if b"\n" not in buf:
+                idx = buf.find(b"\n", max(pos, scan_pos))
+                if idx < 0:
+                    scan_pos = len(buf)
                     break
-                line, buf = buf.split(b"\n", 1)
-                self._process_line(conn, line)
+                # Both parsers accept a bytearray, so the slice is the only copy
+                error = self._process_line(buf[pos:idx])
+                if error is None:
+                    ok += 1
+                else:
+                    errors += 1
+                    reason = error
+                pos = idx + 1
             else:
                 # Compressed mode: read 4-byte header + payload
-                if len(buf) < 4:
+                if len(buf) - pos < 4:
                     break
-                payload_len = struct.unpack("!I", buf[:4])[0]
-                total_len = 4 + payload_len
-                if len(buf) < total_len:
+                (header,) = FRAME_HEADER.unpack_from(buf, pos)
+                total_len = 4 + (header & ~STREAM_CONTINUATION)
+                if len(buf) - pos < total_len:
                     break
-                frame = buf[:total_len]
-                buf = buf[total_len:]
+                if ok or errors:
+                    self._send_ack(conn, ok, errors, reason)
+                    ok = errors = 0
+                    reason = None
+                frame = bytes(buf[pos:pos + total_len])
+                pos += total_len
                 try:
-                    decompressed = decompress_frame(frame)
-                    # Process each NDJSON line in the decompressed data
-                    for line in decompressed.split(b"\n"):
-                        if line.strip():
-                            self._process_line(conn, line)
+                    decompressed = stream.decompress_frame(frame)
                 except (ValueError, Exception) as e:
                     logger.warning("Failed to decompress frame: %s", e)
                     self._send_error(conn, f"decompression failed: {e}")
-        return buf
+                    continue
+                # Process each NDJSON line in the decompressed data
+                frame_ok = frame_errors = 0
+                frame_reason = None
+                for line in decompressed.split(b"\n"):
+                    if line.strip():
+                        error = self._process_line(line)
+                        if error is None:
+                            frame_ok += 1
+                        else:
+                            frame_errors += 1
+                            frame_reason = error
+                self._send_ack(conn, frame_ok, frame_errors, frame_reason)
+        if ok or errors:
+            self._send_ack(conn, ok, errors, reason)
+        del buf[:pos]
+        return max(scan_pos - pos, 0)
+
+    def _process_line(self, line: bytes | bytearray) -> str | None:
+        """Parse one NDJSON line, validate and store it.
 
-    def _process_line(self, conn: socket.socket, line: bytes):
-        """Parse one NDJSON line, validate, store, and ack."""
+        Returns None on success, otherwise the reason it was rejected.
+        """
         try:
-            msg = json.loads(line)
-        except json.JSONDecodeError:
-            self._send_error(conn, "invalid JSON")
-            return
+            msg = _loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return "invalid JSON"
 
+        if not isinstance(msg, dict):
+            return "expected a JSON object"
         if "level" not in msg or "message" not in msg:
-            self._send_error(conn, "missing required fields: level, message")
-            return
+            return "missing required fields: level, message"
 
-        with self._lock:
-            self.received.append(msg)
+        self.received.append(msg)
         logger.info("[%s] %s", msg["level"], msg["message"])
+        return None
 
-        ack = json.dumps({"status": "ok", "message": "received"}) + "\n"
-        try:
-            conn.sendall(ack.encode())
-        except OSError:
-            pass
+    def _send_ack(self, conn: socket.socket, ok: int, errors: int, reason: str | None):
+        """Acknowledge *ok* stored lines and *errors* rejected ones at once."""
+        if errors:
+            resp = _encode_response(
+                {"status": "error", "message": reason, "count": ok, "errors": errors}
+            )
+        else:
+            resp = _OK_ACKS.get(ok)
+            if resp is None:
+                resp = _encode_response({"status": "ok", "message": "received", "count": ok})
+                if len(_OK_ACKS) < _OK_ACKS_MAX:
+                    _OK_ACKS[ok] = resp
+        self._reply(conn, resp)
 
     def _send_error(self, conn: socket.socket, reason: str):
-        """Send an error response."""
-        resp = json.dumps({"status": "error", "message": reason}) + "\n"
-        try:
-            conn.sendall(resp.encode())
-        except OSError:
-            pass
+        """Send an error response that acks no lines."""
+        resp = {"status": "error", "message": reason, "count": 0}
+        self._reply(conn, _encode_response(resp))
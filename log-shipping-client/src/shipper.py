@@ -3,15 +3,28 @@
 import logging
 import threading
 
-from src.compressor import compress_payload
+from src.compressor import StreamCompressor
 from src.config import Config
 from src.file_reader import read_batch, FileTailer
-from src.formatter import parse_log_line, format_ndjson
+from src.formatter import parse_and_format
 from src.tcp_client import TCPClient
 
 logger = logging.getLogger(__name__)
 
 
+def _make_batch_encoder(config: Config):
+    """Return a function turning a batch of NDJSON lines into send parts.
+
+    Config is frozen, so whether to compress is settled once here instead
+    of on every batch. Compressed batches share one stream for the
+    connection's lifetime.
+    """
+    if not config.compress:
+        return lambda batch: batch
+    stream = StreamCompressor(config.compress_level, config.compress_codec)
+    return lambda batch: stream.compress_frame_parts(b"".join(batch))
+
+
 class LogShipper:
     """Reads log lines from a file, formats as NDJSON, and ships over TCP."""
 
@@ -19,6 +32,7 @@ class LogShipper:
         self._config = config
         self._shutdown = shutdown_event
         self._client = TCPClient(config.server_host, config.server_port, shutdown_event)
+        self._encode_batch = _make_batch_encoder(config)
         self._sent = 0
         self._failed = 0
 
@@ -52,11 +66,11 @@ class LogShipper:
         for line in lines:
             if self._shutdown.is_set():
                 break
-            entry = parse_log_line(line)
-            if entry is None:
+            payload = parse_and_format(line)
+            if payload is None:
                 logger.debug("Skipping unparseable line: %s", line[:100])
                 continue
-            batch.append(format_ndjson(entry))
+            batch.append(payload)
             if len(batch) >= self._config.batch_size:
                 self._flush_batch(batch)
                 batch = []
@@ -79,11 +93,11 @@ class LogShipper:
 
     def _buffer_line(self, raw: str):
         """Parse and buffer a line, flushing when batch is full."""
-        entry = parse_log_line(raw)
-        if entry is None:
+        payload = parse_and_format(raw)
+        if payload is None:
             logger.debug("Skipping unparseable line: %s", raw[:100])
             return
-        self._batch_buffer.append(format_ndjson(entry))
+        self._batch_buffer.append(payload)
         if len(self._batch_buffer) >= self._config.batch_size:
             self._flush_batch(self._batch_buffer)
             self._batch_buffer = []
@@ -92,15 +106,9 @@ class LogShipper:
         """Concatenate batch, optionally compress, send, and read acks."""
         if not batch:
             return
-        payload = b"".join(batch)
-        if self._config.compress:
-            payload = compress_payload(payload)
-        if not self._client.send(payload):
+        if not self._client.send_parts(self._encode_batch(batch)):
             self._failed += len(batch)
             return
-        for _ in range(len(batch)):
-            result = self._client.recv_line()
-            if result and result.get("status") == "ok":
-                self._sent += 1
-            else:
-                self._failed += 1
+        acked = self._client.recv_acks(len(batch))
+        self._sent += acked
+        self._failed += len(batch) - acked
@@ -6,8 +6,45 @@ import random
 import socket
 import threading
 
+try:
+    import orjson
+except ImportError:  # optional — faster JSON parsing
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Most buffers passed to a single sendmsg() call (Linux IOV_MAX).
+_IOV_MAX = 1024
+
+# Bytes requested per recv() while waiting for a response line.
+_RECV_SIZE = 64 * 1024
+
+# Kernel send/receive buffer size for shipping connections, so a whole
+# batch fits in the socket buffer and the window can fill in one write.
+SOCKET_BUFFER_SIZE = 1 << 20
+
+
+def set_buffer_sizes(sock: socket.socket):
+    """Size the kernel send/receive buffers; call before connect or listen."""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+
+
+def set_low_latency(sock: socket.socket):
+    """Turn off Nagle and, on Linux, delayed acks for a connected socket.
+
+    Batches and acks are each written in one go, so neither side should
+    wait for more data before sending.
+    """
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    if hasattr(socket, "TCP_QUICKACK"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except
+# clause covers both parsers.
+_loads = orjson.loads if orjson is not None else json.loads
+
 
 class TCPClient:
     """Manages a TCP connection to the log server with reconnect support."""
@@ -17,7 +54,9 @@ class TCPClient:
         self._port = port
         self._shutdown = shutdown_event
         self._sock: socket.socket | None = None
-        self._buffer = b""
+        self._buffer = bytearray()
+        # Offset up to which _buffer is known to hold no newline
+        self._scan_pos = 0
 
     @property
     def connected(self) -> bool:
@@ -28,9 +67,12 @@ class TCPClient:
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(5.0)
+            set_buffer_sizes(sock)
             sock.connect((self._host, self._port))
+            set_low_latency(sock)
             self._sock = sock
-            self._buffer = b""
+            self._buffer.clear()
+            self._scan_pos = 0
             logger.info("Connected to %s:%d", self._host, self._port)
             return True
         except OSError as e:
@@ -45,7 +87,8 @@ class TCPClient:
             except OSError:
                 pass
             self._sock = None
-            self._buffer = b""
+            self._buffer.clear()
+            self._scan_pos = 0
 
     def send(self, data: bytes) -> bool:
         """Send data over the connection. Returns True on success."""
@@ -59,14 +102,48 @@ class TCPClient:
             self.close()
             return False
 
+    def send_parts(self, parts: list[bytes]) -> bool:
+        """Send several buffers back to back without joining them first.
+
+        Uses scatter-gather sendmsg() where available, so a batch of NDJSON
+        lines or a frame header and body go out without an extra copy.
+        Returns True on success.
+        """
+        if not self._sock:
+            return False
+        if not hasattr(self._sock, "sendmsg"):
+            return self.send(b"".join(parts))
+        try:
+            views = [memoryview(p) for p in parts if p]
+            i = 0
+            while i < len(views):
+                sent = self._sock.sendmsg(views[i:i + _IOV_MAX])
+                # Skip fully sent buffers; trim the one cut off mid-way
+                while sent:
+                    n = len(views[i])
+                    if sent >= n:
+                        sent -= n
+                        i += 1
+                    else:
+                        views[i] = views[i][sent:]
+                        sent = 0
+            return True
+        except (BrokenPipeError, ConnectionResetError, OSError) as e:
+            logger.warning("Send failed: %s", e)
+            self.close()
+            return False
+
     def recv_line(self) -> dict | None:
         """Read one newline-delimited JSON response. Returns parsed dict or None."""
         if not self._sock:
             return None
 
-        while b"\n" not in self._buffer:
+        buffer = self._buffer
+        # Only scan bytes that arrived since the last search
+        while (idx := buffer.find(b"\n", self._scan_pos)) < 0:
+            self._scan_pos = len(buffer)
             try:
-                chunk = self._sock.recv(4096)
+                chunk = self._sock.recv(_RECV_SIZE)
             except (ConnectionResetError, OSError) as e:
                 logger.warning("Recv failed: %s", e)
                 self.close()
@@ -75,15 +152,47 @@ class TCPClient:
                 logger.warning("Server closed connection")
                 self.close()
                 return None
-            self._buffer += chunk
+            buffer += chunk
 
-        line, self._buffer = self._buffer.split(b"\n", 1)
+        # Both parsers accept a bytearray, so the slice is the only copy
+        line = buffer[:idx]
+        del buffer[:idx + 1]
+        self._scan_pos = 0
         try:
-            return json.loads(line)
+            return _loads(line)
         except json.JSONDecodeError:
             logger.warning("Invalid JSON response: %s", line[:200])
             return None
 
+    def recv_acks(self, expected: int) -> int:
+        """Read cumulative acks until *expected* sent lines are accounted for.
+
+        The server acks a whole frame, or a run of plain lines, at once with
+        the number stored ("count") and rejected ("errors"). Returns how many
+        lines were stored; stops at the first missing, unreadable or empty
+        response (e.g. a frame that failed to decompress) and drops the
+        connection, so leftover acks can't be read as the next batch's.
+        """
+        acked = seen = 0
+        while seen < expected:
+            result = self.recv_line()
+            if not result:
+                self.close()
+                break
+            if "count" in result:
+                count = result["count"]
+                covered = count + result.get("errors", 0)
+            else:
+                # Per-line ack from a server without cumulative acks
+                count = 1 if result.get("status") == "ok" else 0
+                covered = 1
+            if not covered:
+                self.close()
+                break
+            acked += count
+            seen += covered
+        return acked
+
     def send_and_recv(self, data: bytes) -> dict | None:
         """Send data and read back one NDJSON response."""
         if not self.send(data):
@@ -91,7 +200,11 @@ class TCPClient:
         return self.recv_line()
 
     def connect_with_backoff(self, max_attempts: int = 0) -> bool:
-        """Retry connection with exponential backoff and jitter.
+        """Retry connection with exponential backoff and decorrelated jitter.
+
+        Each wait is drawn between the base delay and three times the
+        previous wait, capped at max_delay, so reconnecting clients spread
+        out instead of retrying in lockstep.
 
         Args:
             max_attempts: Max number of attempts (0 = unlimited until shutdown).
@@ -101,6 +214,7 @@ class TCPClient:
         """
         base_delay = 1.0
         max_delay = 60.0
+        delay = base_delay
         attempt = 0
 
         while not self._shutdown.is_set():
@@ -112,10 +226,8 @@ class TCPClient:
                 logger.error("Exhausted %d connection attempts", max_attempts)
                 return False
 
-            delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
-            jitter = random.uniform(0, delay * 0.3)
-            total_delay = delay + jitter
-            logger.info("Retrying in %.1fs (attempt %d)...", total_delay, attempt)
-            self._shutdown.wait(total_delay)
+            delay = min(max_delay, base_delay + random.random() * (delay * 3 - base_delay))
+            logger.info("Retrying in %.1fs (attempt %d)...", delay, attempt)
+            self._shutdown.wait(delay)
 
         return False
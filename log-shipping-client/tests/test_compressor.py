@@ -1,11 +1,20 @@
 """Tests for the compressor module."""
 
 import gzip
+import importlib.util
 import struct
 
 import pytest
 
-from src.compressor import compress_payload, decompress_frame, is_compressed
+from src import compressor
+from src.compressor import (
+    STREAM_CONTINUATION,
+    StreamCompressor,
+    StreamDecompressor,
+    compress_payload,
+    decompress_frame,
+    is_compressed,
+)
 
 
 class TestCompressPayload:
@@ -25,6 +34,11 @@ class TestCompressPayload:
         assert len(compressed) == length
         assert gzip.decompress(compressed) == data
 
+    def test_roundtrip_any_level(self):
+        data = b'{"level":"INFO","message":"hello"}\n' * 50
+        for level in (1, 6, 9):
+            assert decompress_frame(compress_payload(data, level)) == data
+
     def test_multiple_lines(self):
         lines = b'{"level":"INFO","message":"one"}\n{"level":"ERROR","message":"two"}\n'
         frame = compress_payload(lines)
@@ -32,6 +46,89 @@ class TestCompressPayload:
         assert result == lines
 
 
+@pytest.mark.skipif(compressor.zstandard is None, reason="zstandard not installed")
+class TestZstdCodec:
+    def test_roundtrip(self):
+        data = b'{"level":"INFO","message":"hello"}\n' * 50
+        frame = compress_payload(data, level=3, codec="zstd")
+        assert is_compressed(frame)
+        assert decompress_frame(frame) == data
+
+    def test_frame_format(self):
+        frame = compress_payload(b"test data", codec="zstd")
+        length = struct.unpack("!I", frame[:4])[0]
+        compressed = frame[4:]
+        assert len(compressed) == length
+        assert compressor.zstandard.ZstdDecompressor().decompress(compressed) == b"test data"
+
+
+@pytest.mark.skipif(importlib.util.find_spec("isal") is None, reason="isal not installed")
+class TestIsalBackend:
+    def test_isal_backend_selected(self):
+        from isal import isal_zlib
+        assert compressor._zlib is isal_zlib
+        assert compressor._MAX_LEVEL == 3
+
+    def test_levels_above_max_are_clamped(self):
+        data = b'{"level":"INFO","message":"hello"}\n' * 50
+        for level in range(10):
+            frame = compress_payload(data, level)
+            assert is_compressed(frame)
+            assert gzip.decompress(frame[4:]) == data
+        assert compress_payload(data, 9) == compress_payload(data, 3)
+
+    def test_stream_frames_decode_with_stdlib(self):
+        stream = StreamCompressor(level=9)
+        receiver = StreamDecompressor()
+        for i in range(5):
+            data = b'{"level":"INFO","message":"line %d"}\n' % i
+            assert receiver.decompress_frame(b"".join(stream.compress_frame_parts(data))) == data
+
+
+class TestStreamCompressor:
+    @pytest.mark.parametrize("codec", [
+        "gzip",
+        pytest.param("zstd", marks=pytest.mark.skipif(
+            compressor.zstandard is None, reason="zstandard not installed")),
+    ])
+    def test_frames_decode_in_order(self, codec):
+        stream = StreamCompressor(codec=codec)
+        receiver = StreamDecompressor()
+        for i in range(5):
+            data = b'{"level":"INFO","message":"line %d"}\n' % i
+            frame = b"".join(stream.compress_frame_parts(data))
+            (header,) = struct.unpack("!I", frame[:4])
+            assert bool(header & STREAM_CONTINUATION) == (i > 0)
+            assert receiver.decompress_frame(frame) == data
+
+    def test_later_frames_are_smaller(self):
+        stream = StreamCompressor()
+        data = b'{"timestamp":"2024-01-15 08:23:45","level":"INFO","message":"ok"}\n'
+        first = stream.compress_frame_parts(data)[1]
+        second = stream.compress_frame_parts(data)[1]
+        assert len(second) < len(first)
+
+    def test_reset_starts_new_stream(self):
+        stream = StreamCompressor()
+        stream.compress_frame_parts(b"old connection\n")
+        stream.reset()
+        frame = b"".join(stream.compress_frame_parts(b"new connection\n"))
+        assert is_compressed(frame)
+        assert StreamDecompressor().decompress_frame(frame) == b"new connection\n"
+
+    def test_continuation_without_stream(self):
+        stream = StreamCompressor()
+        stream.compress_frame_parts(b"first\n")
+        frame = b"".join(stream.compress_frame_parts(b"second\n"))
+        with pytest.raises(ValueError, match="Continuation"):
+            StreamDecompressor().decompress_frame(frame)
+
+    def test_independent_frames(self):
+        receiver = StreamDecompressor()
+        for data in (b"one\n", b"two\n"):
+            assert receiver.decompress_frame(compress_payload(data)) == data
+
+
 class TestDecompressFrame:
     def test_too_short(self):
         with pytest.raises(ValueError, match="too short"):
@@ -59,3 +156,10 @@ class TestIsCompressed:
     def test_short_data(self):
         assert is_compressed(b"{") is False
         assert is_compressed(b"") is False
+
+    def test_offset(self):
+        frame = compress_payload(b"test")
+        buf = b'{"level":"INFO"}\n' + frame
+        assert is_compressed(buf) is False
+        assert is_compressed(buf, 17) is True
+        assert is_compressed(buf, len(buf)) is False
@@ -26,6 +26,7 @@ class TestConfigDefaults:
         assert cfg.server_port == 9000
         assert cfg.batch_mode is True
         assert cfg.compress is False
+        assert cfg.compress_level == 1
         assert cfg.batch_size == 1
         assert cfg.metrics_interval == 0
         assert cfg.poll_interval == 0.5
@@ -67,6 +68,21 @@ class TestLoadConfigCLI:
         assert cfg.server_host == "localhost"
         assert cfg.server_port == 9000
 
+    def test_compress_level_cli(self):
+        cfg = load_config(["--compress-level", "6"])
+        assert cfg.compress_level == 6
+
+    def test_compress_codec_cli(self):
+        assert load_config(["--compress-codec", "ZSTD"]).compress_codec == "zstd"
+        with pytest.raises(ValueError, match="codec"):
+            load_config(["--compress-codec", "lz4"])
+
+    def test_unknown_option_warns(self, caplog):
+        with caplog.at_level("WARNING", logger="src.config"):
+            cfg = load_config(["--bufer-size", "10"])
+        assert cfg.buffer_size == Config.buffer_size
+        assert "--bufer-size" in caplog.text
+
     def test_log_file_cli(self):
         cfg = load_config(["--log-file", "/tmp/test.log"])
         assert cfg.log_file == "/tmp/test.log"
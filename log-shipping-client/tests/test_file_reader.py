@@ -1,12 +1,28 @@
 """Tests for file_reader module."""
 
 import os
+import sys
 import threading
 import time
+from unittest import mock
 
+import pytest
+
+from src import file_reader
 from src.file_reader import read_batch, FileTailer
 
 
+def _wait_for(read: threading.Event, done, timeout: float = 2.0):
+    """Wait on the tailer's on_read signal until done() is true or timeout passes."""
+    deadline = time.monotonic() + timeout
+    while not done():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        read.wait(remaining)
+        read.clear()
+
+
 class TestReadBatch:
     def test_reads_all_lines(self, tmp_path):
         f = tmp_path / "test.log"
@@ -40,7 +56,10 @@ class TestFileTailer:
 
         received = []
         shutdown = threading.Event()
-        tailer = FileTailer(str(f), shutdown, callback=received.append, poll_interval=0.05)
+        read = threading.Event()
+        tailer = FileTailer(
+            str(f), shutdown, callback=received.append, poll_interval=0.05, on_read=read.set,
+        )
 
         t = threading.Thread(target=tailer.run, daemon=True)
         t.start()
@@ -54,7 +73,7 @@ class TestFileTailer:
             fh.write("new line 2\n")
             fh.flush()
 
-        time.sleep(0.3)
+        _wait_for(read, lambda: len(received) >= 2)
         shutdown.set()
         t.join(timeout=2)
 
@@ -67,7 +86,10 @@ class TestFileTailer:
         f = tmp_path / "delayed.log"
         received = []
         shutdown = threading.Event()
-        tailer = FileTailer(str(f), shutdown, callback=received.append, poll_interval=0.05)
+        read = threading.Event()
+        tailer = FileTailer(
+            str(f), shutdown, callback=received.append, poll_interval=0.05, on_read=read.set,
+        )
 
         t = threading.Thread(target=tailer.run, daemon=True)
         t.start()
@@ -82,7 +104,7 @@ class TestFileTailer:
             fh.write("appeared!\n")
             fh.flush()
 
-        time.sleep(0.3)
+        _wait_for(read, lambda: "appeared!" in received)
         shutdown.set()
         t.join(timeout=2)
 
@@ -94,7 +116,10 @@ class TestFileTailer:
 
         received = []
         shutdown = threading.Event()
-        tailer = FileTailer(str(f), shutdown, callback=received.append, poll_interval=0.05)
+        read = threading.Event()
+        tailer = FileTailer(
+            str(f), shutdown, callback=received.append, poll_interval=0.05, on_read=read.set,
+        )
 
         t = threading.Thread(target=tailer.run, daemon=True)
         t.start()
@@ -106,20 +131,107 @@ class TestFileTailer:
             fh.write("before truncation\n")
             fh.flush()
 
-        time.sleep(0.2)
+        _wait_for(read, lambda: "before truncation" in received)
 
         # Truncate and write new content
         with open(str(f), "w") as fh:
             fh.write("after truncation\n")
             fh.flush()
 
-        time.sleep(0.3)
+        _wait_for(read, lambda: "after truncation" in received)
         shutdown.set()
         t.join(timeout=2)
 
         assert "before truncation" in received
         assert "after truncation" in received
 
+    def test_rotation_handling(self, tmp_path):
+        f = tmp_path / "test.log"
+        f.write_text("")
+
+        received = []
+        shutdown = threading.Event()
+        read = threading.Event()
+        tailer = FileTailer(
+            str(f), shutdown, callback=received.append, poll_interval=0.05, on_read=read.set,
+        )
+
+        t = threading.Thread(target=tailer.run, daemon=True)
+        t.start()
+
+        time.sleep(0.15)
+
+        with open(str(f), "a") as fh:
+            fh.write("old file line\nunterminated")
+            fh.flush()
+
+        _wait_for(read, lambda: "old file line" in received)
+
+        # Rotate: move the old file aside and start a new one
+        os.rename(str(f), str(tmp_path / "test.log.1"))
+        f.write_text("new file line\n")
+
+        _wait_for(read, lambda: len(received) >= 3)
+        shutdown.set()
+        t.join(timeout=2)
+
+        assert received == ["old file line", "unterminated", "new file line"]
+
+    def test_partial_line_held_until_newline(self, tmp_path):
+        f = tmp_path / "test.log"
+        f.write_text("")
+
+        received = []
+        shutdown = threading.Event()
+        read = threading.Event()
+        tailer = FileTailer(
+            str(f), shutdown, callback=received.append, poll_interval=0.05, on_read=read.set,
+        )
+
+        t = threading.Thread(target=tailer.run, daemon=True)
+        t.start()
+
+        time.sleep(0.15)
+
+        with open(str(f), "a") as fh:
+            fh.write("half a ")
+            fh.flush()
+            time.sleep(0.2)
+            fh.write("line\n")
+            fh.flush()
+
+        _wait_for(read, lambda: received)
+        shutdown.set()
+        t.join(timeout=2)
+
+        assert received == ["half a line"]
+
+    def test_large_append_read_in_blocks(self, tmp_path):
+        f = tmp_path / "test.log"
+        f.write_text("")
+
+        received = []
+        shutdown = threading.Event()
+        read = threading.Event()
+        tailer = FileTailer(
+            str(f), shutdown, callback=received.append, poll_interval=0.05, on_read=read.set,
+        )
+
+        t = threading.Thread(target=tailer.run, daemon=True)
+        t.start()
+
+        time.sleep(0.15)
+
+        lines = [f"line {i:06d} " + "x" * 50 for i in range(5000)]
+        with open(str(f), "a") as fh:
+            fh.write("\n".join(lines) + "\n")
+
+        _wait_for(read, lambda: len(received) >= len(lines))
+        shutdown.set()
+        t.join(timeout=2)
+
+        assert received == lines
+
     def test_shutdown_responsiveness(self, tmp_path):
         f = tmp_path / "test.log"
         f.write_text("")
@@ -135,3 +247,92 @@ class TestFileTailer:
         t.join(timeout=1)
 
         assert not t.is_alive()
+
+    def test_polls_without_inotify(self, tmp_path):
+        f = tmp_path / "test.log"
+        f.write_text("")
+
+        received = []
+        shutdown = threading.Event()
+        read = threading.Event()
+        tailer = FileTailer(
+            str(f), shutdown, callback=received.append, poll_interval=0.05, on_read=read.set,
+        )
+
+        with mock.patch.object(file_reader, "_open_inotify", return_value=None):
+            t = threading.Thread(target=tailer.run, daemon=True)
+            t.start()
+            time.sleep(0.15)
+
+            with open(str(f), "a") as fh:
+                fh.write("polled line\n")
+
+            _wait_for(read, lambda: received)
+            shutdown.set()
+            t.join(timeout=2)
+
+        assert received == ["polled line"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+class TestFileTailerInotify:
+    # A poll interval far longer than the wait below, so only an inotify
+    # wake-up can deliver the lines in time.
+    POLL_INTERVAL = 10.0
+
+    def _start(self, path, received, read):
+        shutdown = threading.Event()
+        tailer = FileTailer(
+            path, shutdown, callback=received.append,
+            poll_interval=self.POLL_INTERVAL, on_read=read.set,
+        )
+        t = threading.Thread(target=tailer.run, daemon=True)
+        t.start()
+        time.sleep(0.2)  # let the tailer reach its idle wait
+        return shutdown, t
+
+    def test_write_wakes_idle_tailer(self, tmp_path):
+        f = tmp_path / "test.log"
+        f.write_text("")
+        received = []
+        read = threading.Event()
+        shutdown, t = self._start(str(f), received, read)
+
+        with open(str(f), "a") as fh:
+            fh.write("woken line\n")
+
+        _wait_for(read, lambda: received, timeout=2.0)
+        assert received == ["woken line"]
+
+        # Shutdown is only noticed after the next wake-up
+        shutdown.set()
+        with open(str(f), "a") as fh:
+            fh.write("\n")
+        t.join(timeout=2)
+        assert not t.is_alive()
+
+    def test_watch_follows_rotation(self, tmp_path):
+        f = tmp_path / "test.log"
+        f.write_text("")
+        received = []
+        read = threading.Event()
+        shutdown, t = self._start(str(f), received, read)
+
+        # Replace the file atomically so the new inode is in place when
+        # the move wakes the tailer.
+        new = tmp_path / "test.log.new"
+        new.write_text("")
+        os.rename(str(f), str(tmp_path / "test.log.1"))
+        os.rename(str(new), str(f))
+        time.sleep(0.2)  # tailer reopens and watches the new file
+
+        with open(str(f), "a") as fh:
+            fh.write("after rotation\n")
+
+        _wait_for(read, lambda: received, timeout=2.0)
+        assert received == ["after rotation"]
+
+        shutdown.set()
+        with open(str(f), "a") as fh:
+            fh.write("\n")
+        t.join(timeout=2)
@@ -1,7 +1,8 @@
 """Tests for formatter module."""
 
 import json
-from src.formatter import parse_log_line, format_ndjson
+from src import formatter
+from src.formatter import parse_and_format, parse_log_line, format_ndjson
 
 
 class TestParseLogLine:
@@ -88,3 +89,22 @@ class TestFormatNdjson:
         ndjson_bytes = format_ndjson(entry)
         roundtripped = json.loads(ndjson_bytes.decode("utf-8"))
         assert roundtripped == entry
+
+
+class TestParseAndFormat:
+    def test_matches_parse_then_format(self):
+        for line in (
+            "2024-01-15 08:23:45 INFO Application started",
+            '2024-01-15 08:23:45 warn user="john" path=C:\\tmp\ttab',
+            "2024-01-15 08:23:45 INFO caf\u00e9 \u2603",
+        ):
+            assert parse_and_format(line) == format_ndjson(parse_log_line(line))
+
+    def test_matches_stdlib_fallback(self, monkeypatch):
+        monkeypatch.setattr(formatter, "orjson", None)
+        line = "2024-01-15 08:23:45 INFO caf\u00e9 \"quoted\" \u2603"
+        assert parse_and_format(line) == format_ndjson(parse_log_line(line))
+
+    def test_unparseable(self):
+        assert parse_and_format("not a valid log line at all") is None
+        assert parse_and_format("") is None
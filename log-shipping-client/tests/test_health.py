@@ -5,6 +5,7 @@ import threading
 import time
 
 from src.health import HealthMonitor
+from src.tcp_client import TCPClient
 
 
 def _start_listener():
@@ -103,6 +104,36 @@ class TestHealthMonitorTransition:
                 pass
 
 
+class TestHealthMonitorClient:
+    def test_connected_client_skips_probe(self):
+        """A connected client counts as healthy without a connect probe."""
+        listener, host, port = _start_listener()
+        shutdown = threading.Event()
+        client = TCPClient(host, port, shutdown)
+        try:
+            assert client.connect() is True
+            listener.close()  # any active probe would now fail
+
+            monitor = HealthMonitor(host, port, shutdown, interval=0.1, client=client)
+            monitor.start()
+            assert monitor.wait_for_healthy(timeout=2.0) is True
+        finally:
+            shutdown.set()
+            client.close()
+            listener.close()
+
+    def test_disconnected_client_probes(self):
+        """A disconnected client falls back to the connect probe."""
+        shutdown = threading.Event()
+        client = TCPClient("127.0.0.1", 1, shutdown)
+        monitor = HealthMonitor("127.0.0.1", 1, shutdown, interval=0.1, client=client)
+        try:
+            monitor.start()
+            assert monitor.wait_for_healthy(timeout=0.5) is False
+        finally:
+            shutdown.set()
+
+
 class TestWaitForHealthy:
     def test_wait_timeout(self):
         """wait_for_healthy returns False on timeout when no server."""
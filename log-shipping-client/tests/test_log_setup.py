@@ -0,0 +1,22 @@
+"""Tests for the logging setup module."""
+
+import logging
+
+from src.log_setup import configure_logging
+
+
+class TestConfigureLogging:
+    def test_records_reach_stderr(self, capsys):
+        root = logging.getLogger()
+        before, level = list(root.handlers), root.level
+        listener = configure_logging()
+        try:
+            logging.getLogger("test.log_setup").info("queued hello")
+        finally:
+            listener.stop()
+            for handler in root.handlers[len(before):]:
+                root.removeHandler(handler)
+            root.setLevel(level)
+
+        err = capsys.readouterr().err
+        assert "[INFO] test.log_setup — queued hello" in err
@@ -33,6 +33,26 @@ class TestMetricsCounters:
         assert snap["avg_latency_ms"] == 20.0
         assert snap["max_latency_ms"] == 30.0
 
+    def test_record_counts(self):
+        m = Metrics()
+        m.record_sent(10.0, count=3)
+        m.record_sent(40.0)
+        m.record_failed(count=2)
+        snap = m.snapshot_and_reset()
+        assert snap["sent"] == 4
+        assert snap["failed"] == 2
+        assert snap["avg_latency_ms"] == 17.5
+        assert snap["max_latency_ms"] == 40.0
+
+    def test_record_sent_ns(self):
+        m = Metrics()
+        m.record_sent_ns(1_500_000, count=2)
+        m.record_sent(3.0)
+        snap = m.snapshot_and_reset()
+        assert snap["sent"] == 3
+        assert snap["avg_latency_ms"] == 2.0
+        assert snap["max_latency_ms"] == 3.0
+
     def test_buffer_usage(self):
         m = Metrics()
         m.record_buffer_usage(100)
@@ -50,6 +50,31 @@ class TestResilientShipperBatch:
         finally:
             shutdown.set()
 
+    def test_compressed_batches_delivered(self, tmp_path):
+        server, host, port, shutdown = _start_test_server()
+        try:
+            log_file = tmp_path / "test.log"
+            log_file.write_text(
+                "".join(f"2024-01-15 08:23:{i:02d} INFO Line {i}\n" for i in range(25))
+            )
+            config = Config(
+                log_file=str(log_file),
+                server_host=host,
+                server_port=port,
+                batch_mode=True,
+                compress=True,
+                batch_size=10,
+                resilient=True,
+            )
+            shipper = ResilientLogShipper(config, shutdown)
+            shipper.run()
+
+            assert shipper.sent == 25
+            assert shipper.failed == 0
+            assert len(server.received) == 25
+        finally:
+            shutdown.set()
+
 
 class TestResilientShipperReconnect:
     def test_reconnects_after_server_restart(self, tmp_path):
@@ -86,6 +111,61 @@ class TestResilientShipperReconnect:
             shutdown.set()
 
 
+    def test_micro_batches_delivered(self, tmp_path):
+        server, host, port, shutdown = _start_test_server()
+        try:
+            log_file = tmp_path / "test.log"
+            log_file.write_text(
+                "".join(f"2024-01-15 08:23:{i % 60:02d} INFO Line {i}\n" for i in range(50))
+            )
+            config = Config(
+                log_file=str(log_file),
+                server_host=host,
+                server_port=port,
+                batch_mode=True,
+                batch_size=7,
+                micro_batch=4,
+                resilient=True,
+            )
+            shipper = ResilientLogShipper(config, shutdown)
+            shipper.run()
+
+            assert shipper.sent == 50
+            assert shipper.failed == 0
+            assert [r["message"] for r in server.received] == [f"Line {i}" for i in range(50)]
+        finally:
+            shutdown.set()
+
+
+    def test_parallel_senders_deliver_everything(self, tmp_path):
+        server, host, port, shutdown = _start_test_server()
+        try:
+            log_file = tmp_path / "test.log"
+            log_file.write_text(
+                "".join(f"2024-01-15 08:23:{i % 60:02d} INFO Line {i}\n" for i in range(60))
+            )
+            config = Config(
+                log_file=str(log_file),
+                server_host=host,
+                server_port=port,
+                batch_mode=True,
+                batch_size=5,
+                micro_batch=10,
+                parallelism=3,
+                resilient=True,
+            )
+            shipper = ResilientLogShipper(config, shutdown)
+            shipper.run()
+
+            assert shipper.sent == 60
+            assert shipper.failed == 0
+            assert sorted(r["message"] for r in server.received) == sorted(
+                f"Line {i}" for i in range(60)
+            )
+        finally:
+            shutdown.set()
+
+
 class TestResilientShipperBufferFull:
     def test_drops_when_buffer_full(self, tmp_path):
         """With a tiny buffer and no server, lines should be dropped."""
@@ -5,6 +5,7 @@ import socket
 import threading
 import time
 
+from src.compressor import StreamCompressor
 from src.server import SimpleLogServer
 
 
@@ -70,6 +71,22 @@ class TestSimpleLogServer:
         finally:
             server.stop()
 
+    def test_non_object_lines_rejected(self):
+        server, host, port = _start_server()
+        try:
+            for payload in (b"5555555\n", b'"level message"\n'):
+                resp = _send_and_recv(host, port, payload)
+                assert resp["status"] == "error"
+                assert resp["message"] == "expected a JSON object"
+
+            # The server keeps serving other clients
+            msg = json.dumps({"level": "INFO", "message": "still up"}) + "\n"
+            resp = _send_and_recv(host, port, msg.encode())
+            assert resp["status"] == "ok"
+            assert server.received[-1]["message"] == "still up"
+        finally:
+            server.stop()
+
     def test_multiple_messages(self):
         server, host, port = _start_server()
         try:
@@ -91,3 +108,132 @@ class TestSimpleLogServer:
             assert len(server.received) == 3
         finally:
             server.stop()
+
+    def test_line_split_across_sends(self):
+        server, host, port = _start_server()
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(5.0)
+            sock.connect((host, port))
+
+            msg = (json.dumps({"level": "INFO", "message": "split"}) + "\n").encode()
+            for i in range(0, len(msg), 5):
+                sock.sendall(msg[i:i + 5])
+                time.sleep(0.01)
+            buf = b""
+            while b"\n" not in buf:
+                buf += sock.recv(4096)
+            assert json.loads(buf.split(b"\n")[0])["status"] == "ok"
+
+            sock.close()
+            time.sleep(0.1)
+            assert [m["message"] for m in server.received] == ["split"]
+        finally:
+            server.stop()
+
+    def test_one_ack_per_burst(self):
+        server, host, port = _start_server()
+        try:
+            payload = b"".join(
+                (json.dumps({"level": "INFO", "message": f"msg {i}"}) + "\n").encode()
+                for i in range(3)
+            ) + b"not json\n"
+            resp = _send_and_recv(host, port, payload)
+            assert resp["status"] == "error"
+            assert resp["count"] + resp["errors"] == 4
+            time.sleep(0.1)
+            assert len(server.received) == resp["count"]
+        finally:
+            server.stop()
+
+    def test_concurrent_clients(self):
+        server, host, port = _start_server()
+        try:
+            socks = []
+            for _ in range(3):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.settimeout(5.0)
+                sock.connect((host, port))
+                socks.append(sock)
+
+            for i, sock in enumerate(socks):
+                msg = json.dumps({"level": "INFO", "message": f"client {i}"}) + "\n"
+                sock.sendall(msg.encode())
+            for sock in socks:
+                buf = b""
+                while b"\n" not in buf:
+                    buf += sock.recv(4096)
+                assert json.loads(buf.split(b"\n")[0])["status"] == "ok"
+                sock.close()
+
+            time.sleep(0.1)
+            assert sorted(m["message"] for m in server.received) == [
+                "client 0", "client 1", "client 2",
+            ]
+        finally:
+            server.stop()
+
+    def test_stop_wakes_idle_server(self):
+        shutdown = threading.Event()
+        server = SimpleLogServer("127.0.0.1", 0, shutdown)
+        t = threading.Thread(target=server.start, daemon=True)
+        t.start()
+        for _ in range(50):
+            if server.server_address:
+                break
+            time.sleep(0.02)
+
+        start = time.monotonic()
+        server.stop()
+        t.join(timeout=2)
+        assert not t.is_alive()
+        assert time.monotonic() - start < 0.5
+
+    def test_acks_for_pipelined_lines(self):
+        server, host, port = _start_server()
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(5.0)
+            sock.connect((host, port))
+
+            total = 20000
+            payload = b"".join(
+                (json.dumps({"level": "INFO", "message": f"msg {i}"}) + "\n").encode()
+                for i in range(total)
+            )
+            sock.sendall(payload)
+
+            acked = 0
+            buf = b""
+            while acked < total:
+                buf += sock.recv(65536)
+                *lines, buf = buf.split(b"\n")
+                acked += sum(json.loads(line)["count"] for line in lines)
+            sock.close()
+
+            assert acked == total
+            assert len(server.received) == total
+        finally:
+            server.stop()
+
+    def test_compression_stream(self):
+        server, host, port = _start_server()
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(5.0)
+            sock.connect((host, port))
+
+            stream = StreamCompressor()
+            buf = b""
+            for i in range(3):
+                line = json.dumps({"level": "INFO", "message": f"msg {i}"}) + "\n"
+                sock.sendall(b"".join(stream.compress_frame_parts(line.encode())))
+                while b"\n" not in buf:
+                    buf += sock.recv(4096)
+                ack, buf = buf.split(b"\n", 1)
+                assert json.loads(ack) == {"status": "ok", "message": "received", "count": 1}
+            sock.close()
+
+            assert [m["message"] for m in server.received] == ["msg 0", "msg 1", "msg 2"]
+        finally:
+            server.stop()
@@ -104,10 +104,53 @@ class TestTCPClientSendRecv:
         finally:
             shutdown.set()
 
+    def test_send_parts(self):
+        shutdown = threading.Event()
+        host, port = _start_echo_server(shutdown)
+        try:
+            client = TCPClient(host, port, shutdown)
+            client.connect()
+            # More parts than one sendmsg() call accepts
+            parts = [
+                (json.dumps({"level": "INFO", "message": f"msg {i}"}) + "\n").encode()
+                for i in range(1500)
+            ]
+            assert client.send_parts(parts) is True
+            for _ in parts:
+                assert client.recv_line() == {"status": "ok", "message": "received"}
+            client.close()
+        finally:
+            shutdown.set()
+
+    def test_recv_acks_per_line_server(self):
+        shutdown = threading.Event()
+        host, port = _start_echo_server(shutdown)
+        try:
+            client = TCPClient(host, port, shutdown)
+            client.connect()
+            lines = [json.dumps({"level": "INFO", "message": f"m{i}"}).encode() + b"\n" for i in range(4)]
+            assert client.send_parts(lines) is True
+            assert client.recv_acks(len(lines)) == 4
+            client.close()
+        finally:
+            shutdown.set()
+
+    def test_recv_acks_drops_connection_on_bad_response(self):
+        shutdown = threading.Event()
+        client = TCPClient("127.0.0.1", 0, shutdown)
+        client._sock, server = socket.socketpair()
+        try:
+            server.sendall(b'{"status":"ok","count":2}\nnot json\n{"status":"ok","count":1}\n')
+            assert client.recv_acks(5) == 2
+            assert client.connected is False
+        finally:
+            server.close()
+
     def test_send_without_connection(self):
         shutdown = threading.Event()
         client = TCPClient("127.0.0.1", 1, shutdown)
         assert client.send(b"data") is False
+        assert client.send_parts([b"data"]) is False
         assert client.recv_line() is None
 
 
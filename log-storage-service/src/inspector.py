@@ -1,8 +1,17 @@
 """Inspector logic: list, read, and search log files."""
 
 import gzip
+import mmap
 import os
 
+# Approximate bytes scanned at a time by search_files; blocks are extended
+# to the next newline so no line is split between them.
+SEARCH_BLOCK_SIZE = 64 * 1024
+
+# Hits in one block above which decoding and splitting the whole block is
+# cheaper than cutting out each hit's line.
+_DENSE_HITS = 32
+
 
 def list_log_files(log_dir: str) -> list[str]:
     """Return all log-related files (active .log, rotated, and .gz) sorted by name."""
@@ -27,20 +36,101 @@ def read_file(log_dir: str, filename: str) -> str:
             return f.read()
 
 
+def _matching_lines(data, needle: bytes):
+    """Yield (line_index, line) for each line of *data* containing *needle*.
+
+    The needle is searched for across the whole buffer with find(); line
+    boundaries are only located around each hit, and only the lines
+    skipped between hits are counted. Indexes are 0-based and lines
+    exclude the newline.
+    """
+    size = len(data)
+    pos = counted = line_index = 0
+    while pos < size:
+        hit = data.find(needle, pos)
+        if hit < 0:
+            return
+        nl = data.rfind(b"\n", pos, hit)
+        start = pos if nl < 0 else nl + 1
+        end = data.find(b"\n", hit)
+        if end < 0:
+            end = size
+        line_index += data[counted:start].count(b"\n")
+        yield line_index, data[start:end]
+        line_index += 1
+        pos = counted = end + 1
+
+
+def _scan_block(
+    block: bytes, needle: bytes, text: str, filename: str, line_num: int, results: list,
+):
+    """Append search results for the lines in *block* containing the needle.
+
+    *block* is a run of whole lines of *filename* starting at *line_num*,
+    each ending in a newline except possibly the last.
+    """
+    hits = block.count(needle)
+    if not hits:
+        return
+    if hits > _DENSE_HITS and not needle.endswith(b"\n"):
+        lines = block.decode("utf-8", "replace").split("\n")
+        if block.endswith(b"\n"):
+            lines.pop()
+        results += [
+            (filename, n, line) for n, line in enumerate(lines, line_num) if text in line
+        ]
+        return
+    for index, line in _matching_lines(block, needle):
+        results.append((filename, line_num + index, line.decode("utf-8", "replace")))
+
+
+def _plain_blocks(path: str):
+    """Yield an uncompressed file as blocks of whole lines, via mmap."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return  # an empty file cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while pos < size:
+                end = mm.find(b"\n", min(pos + SEARCH_BLOCK_SIZE, size) - 1)
+                end = size if end < 0 else end + 1
+                yield mm[pos:end]
+                pos = end
+
+
+def _gzip_blocks(path: str):
+    """Yield a .gz file's decompressed content as blocks of whole lines."""
+    carry = b""
+    with gzip.open(path, "rb") as f:
+        while chunk := f.read(SEARCH_BLOCK_SIZE):
+            block = carry + chunk
+            cut = block.rfind(b"\n") + 1
+            if cut:
+                yield block[:cut]
+            carry = block[cut:]
+    if carry:
+        yield carry
+
+
 def search_files(log_dir: str, text: str) -> list[tuple[str, int, str]]:
-    """Search for text across all log files. Returns (filename, line_num, line) tuples."""
+    """Search for text across all log files. Returns (filename, line_num, line) tuples.
+
+    Files are scanned in blocks with bytes searches, so blocks without a
+    match cost no per-line work at all.
+    """
+    needle = text.encode()
     results = []
+    if b"\n" in needle[:-1]:
+        return results  # no single line can contain it
     for filename in list_log_files(log_dir):
         path = os.path.join(log_dir, filename)
+        blocks = _gzip_blocks if filename.endswith(".gz") else _plain_blocks
+        line_num = 1
         try:
-            if filename.endswith(".gz"):
-                f = gzip.open(path, "rt")
-            else:
-                f = open(path, "r")
-            with f:
-                for line_num, line in enumerate(f, 1):
-                    if text in line:
-                        results.append((filename, line_num, line.rstrip("\n")))
-        except (OSError, gzip.BadGzipFile):
+            for block in blocks(path):
+                _scan_block(block, needle, text, filename, line_num, results)
+                line_num += block.count(b"\n")
+        except (OSError, EOFError, gzip.BadGzipFile):
             continue
     return results
@@ -2,10 +2,18 @@
 
 import os
 import threading
+import time
 from datetime import datetime, timezone
 
 from src.config import Config
 
+# Buffered bytes that trigger a write to the file.
+BUFFER_LIMIT = 64 * 1024
+
+# Longest time (seconds) an entry may sit in the buffer before a write()
+# flushes it, so readers of the active file see entries promptly.
+FLUSH_INTERVAL = 1.0
+
 
 class LogWriter:
     def __init__(self, config: Config, time_func=None):
@@ -15,21 +23,36 @@ class LogWriter:
         self._file = None
         self._filepath = os.path.join(config.log_dir, config.log_filename)
         self._last_rotation = self._time_func()
+        # Encoded entries not yet written; one write() per flush instead of
+        # one per entry.
+        self._buf = bytearray()
+        # Size of the active file including buffered entries, kept as a
+        # running count so the rotation check needs no stat per entry.
+        self._size = 0
+        self._last_flush = time.monotonic()
         os.makedirs(config.log_dir, exist_ok=True)
         self._open()
 
     def _open(self):
-        self._file = open(self._filepath, "a")
+        self._file = open(self._filepath, "ab", buffering=0)
+        self._size = os.fstat(self._file.fileno()).st_size
 
     def _close(self):
         if self._file and not self._file.closed:
+            self._flush()
             self._file.close()
 
+    def _flush(self):
+        """Write the buffered entries to the file."""
+        with memoryview(self._buf) as view:
+            written = 0
+            while written < len(view):
+                written += self._file.write(view[written:])
+        self._buf.clear()
+        self._last_flush = time.monotonic()
+
     def _should_rotate_size(self) -> bool:
-        try:
-            return os.path.getsize(self._filepath) >= self._config.max_file_size_bytes
-        except OSError:
-            return False
+        return self._size >= self._config.max_file_size_bytes
 
     def _should_rotate_time(self) -> bool:
         elapsed = (self._time_func() - self._last_rotation).total_seconds()
@@ -48,15 +71,30 @@ class LogWriter:
         return rotated_path
 
     def write(self, entry: str) -> str | None:
-        """Append a line. Returns rotated file path if rotation occurred."""
+        """Append a line. Returns rotated file path if rotation occurred.
+
+        Entries are buffered and reach the file once BUFFER_LIMIT bytes are
+        pending, FLUSH_INTERVAL has passed, or on rotation, flush() or close().
+        """
         with self._lock:
-            self._file.write(entry if entry.endswith("\n") else entry + "\n")
-            self._file.flush()
+            data = (entry if entry.endswith("\n") else entry + "\n").encode()
+            self._buf += data
+            self._size += len(data)
+            if (
+                len(self._buf) >= BUFFER_LIMIT
+                or time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+            ):
+                self._flush()
 
             if self._should_rotate_size() or self._should_rotate_time():
                 return self._rotate()
             return None
 
+    def flush(self):
+        """Write any buffered entries to the active file."""
+        with self._lock:
+            self._flush()
+
     def close(self):
         with self._lock:
             self._close()
@@ -110,6 +110,24 @@ class TestSearchFiles(unittest.TestCase):
         self.assertEqual(results[0][1], 2)  # line number
         self.assertEqual(results[1][1], 4)
 
+    def test_search_large_files_across_blocks(self):
+        lines = [f"line {i:06d} {'ERROR' if i % 7 == 0 else 'INFO'}" for i in range(20000)]
+        lines.append("last line TARGET without newline")
+        content = "\n".join(lines)
+        with open(os.path.join(self.tmpdir, "app.log"), "w") as f:
+            f.write(content)
+        with gzip.open(os.path.join(self.tmpdir, "app.log.1.gz"), "wt") as f:
+            f.write(content)
+
+        for text in ("ERROR", "line 012345", "TARGET"):
+            expected = [
+                (i, line) for i, line in enumerate(lines, 1) if text in line
+            ]
+            results = search_files(self.tmpdir, text)
+            for name in ("app.log", "app.log.1.gz"):
+                found = [(n, line) for f, n, line in results if f == name]
+                self.assertEqual(found, expected)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -9,7 +9,7 @@ import unittest
 from datetime import datetime, timezone, timedelta
 
 from src.config import Config
-from src.writer import LogWriter
+from src.writer import BUFFER_LIMIT, LogWriter
 
 
 class TestWriterBasic(unittest.TestCase):
@@ -52,6 +52,27 @@ class TestWriterBasic(unittest.TestCase):
             lines = f.readlines()
         self.assertEqual(lines, ["line1\n", "line2\n"])
 
+    def test_entries_buffered_until_flush(self):
+        cfg = self._config()
+        writer = LogWriter(cfg)
+        path = os.path.join(self.tmpdir, "test.log")
+        writer.write("buffered")
+        self.assertEqual(os.path.getsize(path), 0)
+        writer.flush()
+        with open(path) as f:
+            self.assertEqual(f.read(), "buffered\n")
+        writer.close()
+
+    def test_full_buffer_is_written(self):
+        cfg = self._config()
+        writer = LogWriter(cfg)
+        line = "x" * 1023
+        for _ in range(BUFFER_LIMIT // 1024):
+            writer.write(line)
+        size = os.path.getsize(os.path.join(self.tmpdir, "test.log"))
+        writer.close()
+        self.assertEqual(size, BUFFER_LIMIT)
+
     def test_no_rotation_returns_none(self):
         cfg = self._config()
         writer = LogWriter(cfg)
@@ -92,6 +113,26 @@ class TestSizeRotation(unittest.TestCase):
         # Active log should still exist (fresh file)
         self.assertTrue(os.path.exists(os.path.join(self.tmpdir, "test.log")))
 
+    def test_existing_file_counts_toward_size(self):
+        path = os.path.join(self.tmpdir, "test.log")
+        with open(path, "w") as f:
+            f.write("x" * 45 + "\n")
+        cfg = Config(
+            log_dir=self.tmpdir,
+            log_filename="test.log",
+            max_file_size_bytes=50,
+            rotation_interval_seconds=999999,
+            max_file_count=10,
+            max_age_days=7,
+            compression_enabled=True,
+        )
+        writer = LogWriter(cfg)
+        rotated_path = writer.write("more")
+        writer.close()
+
+        self.assertIsNotNone(rotated_path)
+        self.assertEqual(os.path.getsize(os.path.join(self.tmpdir, "test.log")), 0)
+
     def test_rotated_file_naming(self):
         cfg = Config(
             log_dir=self.tmpdir,